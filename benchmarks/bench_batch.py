@@ -0,0 +1,61 @@
+import argparse
+import random
+import timeit
+
+import middle
+
+from middle_schema.batch import compile_batch_validator
+from middle_schema.validator import compile_validator
+
+
+class Measurement(middle.Model):
+    sensor = middle.field(type=str, min_length=3, max_length=16)
+    value = middle.field(type=float, minimum=-100, maximum=100)
+    samples = middle.field(type=int, minimum=1, multiple_of=10)
+    calibrated = middle.field(type=bool, default=False)
+
+
+def _records(size, seed=42):
+    rnd = random.Random(seed)
+    return [
+        {
+            "sensor": "sensor-{}".format(
+                rnd.randint(0, 10 ** rnd.randint(0, 14))
+            ),
+            "value": rnd.uniform(-110, 110),
+            "samples": rnd.choice([0, 10, 15, 20, 100]),
+            "calibrated": rnd.random() > 0.5,
+        }
+        for _ in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Batch (NumPy) validation against the compiled validator"
+    )
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = _records(args.size)
+    batch = compile_batch_validator(Measurement)
+    scalar = compile_validator(Measurement)
+    assert batch(records).tolist() == [bool(scalar(r)) for r in records]
+
+    scalar_time = min(
+        timeit.repeat(
+            lambda: [scalar(r) for r in records], number=1, repeat=args.repeat
+        )
+    )
+    batch_time = min(
+        timeit.repeat(lambda: batch(records), number=1, repeat=args.repeat)
+    )
+    print("records:         {}".format(args.size))
+    print("compiled:        {:.3f}s".format(scalar_time))
+    print("batch (numpy):   {:.3f}s".format(batch_time))
+    print("speedup:         {:.1f}x".format(scalar_time / batch_time))
+
+
+if __name__ == "__main__":
+    main()
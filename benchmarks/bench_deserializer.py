@@ -0,0 +1,51 @@
+import argparse
+import timeit
+
+from bench_serializer import Customer
+from bench_serializer import _instances
+
+from middle_schema.deserializer import compile_deserializer
+from middle_schema.serializer import compile_serializer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compiled deserializer against middle.Model(**data)"
+    )
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    serialize = compile_serializer(Customer, decimal=str)
+    payloads = [serialize(i) for i in _instances(args.size)]
+    deserialize = compile_deserializer(Customer)
+    trusted = compile_deserializer(Customer, validate=False)
+
+    def _time(fn):
+        return min(
+            timeit.repeat(
+                lambda: [fn(p) for p in payloads],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+
+    generic = _time(lambda p: Customer(**p))
+    compiled = _time(deserialize)
+    compiled_trusted = _time(trusted)
+    print("payloads:               {}".format(args.size))
+    print("middle.Model(**data):   {:.3f}s".format(generic))
+    print(
+        "compiled (validated):   {:.3f}s ({:.1f}x)".format(
+            compiled, generic / compiled
+        )
+    )
+    print(
+        "compiled (trusted):     {:.3f}s ({:.1f}x)".format(
+            compiled_trusted, generic / compiled_trusted
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
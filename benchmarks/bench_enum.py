@@ -0,0 +1,60 @@
+import argparse
+import enum
+import timeit
+
+import middle
+
+from middle_schema.openapi import parse
+from middle_schema.skel import translate
+
+
+def _enum(name, size):
+    return enum.Enum(
+        name, [("M{}".format(i), "M{}".format(i)) for i in range(size)]
+    )
+
+
+def _model(enums, fields):
+    return type(
+        "LargeEnumModel",
+        (middle.Model,),
+        {
+            "field_{}".format(i): middle.field(
+                type=enums[i % len(enums)], description="Field {}".format(i)
+            )
+            for i in range(fields)
+        },
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Models with many fields using large enums"
+    )
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--enums", type=int, default=3)
+    parser.add_argument("--fields", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    enums = [
+        _enum("Enum{}".format(i), args.members) for i in range(args.enums)
+    ]
+    model = _model(enums, args.fields)
+
+    print("members:             {}".format(args.members))
+    print("fields:              {}".format(args.fields))
+    for name, fn, config in (
+        ("translate", translate, {}),
+        ("parse (components)", parse, {"openapi_enum_as_component": True}),
+        ("parse (inline)", parse, {"openapi_enum_as_component": False}),
+    ):
+        with middle.config.temp(**config):
+            elapsed = min(
+                timeit.repeat(lambda: fn(model), number=1, repeat=args.repeat)
+            )
+        print("{:<20} {:.1f}ms".format(name + ":", elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    main()
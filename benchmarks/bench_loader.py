@@ -0,0 +1,67 @@
+import argparse
+import json
+import time
+
+from middle_schema.loader import load_models
+
+
+def _document(size, fields):
+    schemas = {}
+    for i in range(size):
+        properties = {
+            "field_{}".format(j): {
+                "type": "string",
+                "maxLength": 100,
+                "description": "Field {} of model {}".format(j, i),
+            }
+            for j in range(fields)
+        }
+        if i % 10:  # chains of 10 models
+            properties["previous"] = {
+                "$ref": "#/components/schemas/Model{}".format(i - 1)
+            }
+        schemas["Model{}".format(i)] = {
+            "type": "object",
+            "properties": properties,
+            "required": sorted(properties),
+        }
+    return {"openapi": "3.0.0", "components": {"schemas": schemas}}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Loading models from a large specification"
+    )
+    parser.add_argument("--models", type=int, default=5000)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    data = json.dumps(_document(args.models, args.fields))
+    document, elapsed = _timed(lambda: json.loads(data))
+    print("json.loads:         {:.1f}ms".format(elapsed))
+    models, elapsed = _timed(lambda: load_models(document))
+    print("load_models:        {:.3f}ms".format(elapsed))
+    _, elapsed = _timed(lambda: models.Model9)
+    print(
+        "first model used:   {:.1f}ms ({} loaded)".format(
+            elapsed, len(models.loaded)
+        )
+    )
+    _, elapsed = _timed(lambda: models.Model9)
+    print("same model again:   {:.3f}ms".format(elapsed))
+    _, elapsed = _timed(lambda: [models[name] for name in models])
+    print(
+        "every model:        {:.1f}ms ({} loaded)".format(
+            elapsed, len(models.loaded)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
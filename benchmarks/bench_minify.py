@@ -0,0 +1,46 @@
+import argparse
+import json
+
+import middle
+
+from middle_schema.openapi import parse
+from suite import Game
+from suite import _shared_model
+from suite import _wide_model
+
+
+def _document(model, minify):
+    with middle.config.temp(openapi_minify=minify):
+        api = parse(model)
+    return json.dumps(
+        {
+            "components": {"schemas": api.components},
+            "schema": api.specification,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Document size with and without openapi_minify"
+    )
+    parser.parse_args()
+
+    models = {
+        "game": Game,
+        "wide": _wide_model(),
+        "shared": _shared_model(),
+    }
+    print("{:<10} {:>10} {:>10} {:>8}".format("model", "full", "minified", ""))
+    for name, model in models.items():
+        full, minified = _document(model, False), _document(model, True)
+        print(
+            "{:<10} {:>10} {:>10} {:>7.1%}".format(
+                name, len(full), len(minified), len(minified) / len(full) - 1
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import time
+
+import middle
+
+from middle_schema.routes import Routes
+
+
+def _models(size, fields):
+    return [
+        type(
+            "Model{}".format(i),
+            (middle.Model,),
+            {
+                "field_{}".format(j): middle.field(
+                    type=str, description="Field {} of model {}".format(j, i)
+                )
+                for j in range(fields)
+            },
+        )
+        for i in range(size)
+    ]
+
+
+def _handler(request_model, response_model):
+    def handler(request, body: request_model) -> response_model:
+        pass
+
+    return handler
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Startup time of many routes, lazy and eager"
+    )
+    parser.add_argument("--routes", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    models = _models(args.routes + 1, args.fields)
+    handlers = [_handler(models[i], models[i + 1]) for i in range(args.routes)]
+    routes = Routes()
+
+    def register():
+        for i, handler in enumerate(handlers):
+            routes.add("/route/{}".format(i), handler, methods=["POST"])
+
+    print("register (lazy):   {:.1f}ms".format(_timed(register)))
+    print(
+        "first access:      {:.2f}ms".format(
+            _timed(lambda: routes.schema("POST", "/route/0"))
+        )
+    )
+    print("every route:       {:.1f}ms".format(_timed(routes.document)))
+
+
+if __name__ == "__main__":
+    main()
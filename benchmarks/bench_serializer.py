@@ -0,0 +1,80 @@
+import argparse
+import datetime
+import enum
+import timeit
+import typing as t
+from decimal import Decimal
+
+import middle
+
+from middle_schema.serializer import compile_serializer
+
+
+@enum.unique
+class StatusEnum(str, enum.Enum):
+    ACTIVE = "ACTIVE"
+    INACTIVE = "INACTIVE"
+
+
+class Address(middle.Model):
+    street = middle.field(type=str)
+    number = middle.field(type=int)
+
+
+class Customer(middle.Model):
+    name = middle.field(type=str)
+    balance = middle.field(type=Decimal)
+    status = middle.field(type=StatusEnum)
+    birthday = middle.field(type=datetime.date)
+    address = middle.field(type=Address)
+    tags = middle.field(type=t.List[str])
+
+
+def _instances(size):
+    return [
+        Customer(
+            name="Customer {}".format(i),
+            balance=Decimal(i) / 100,
+            status=StatusEnum.ACTIVE,
+            birthday=datetime.date(1980, 1, 1 + i % 28),
+            address=Address(street="Some street", number=i),
+            tags=["a", "b"],
+        )
+        for i in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compiled serializer against middle.asdict"
+    )
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    instances = _instances(args.size)
+    serialize = compile_serializer(Customer)
+    assert serialize(instances[0]) == middle.asdict(instances[0])
+
+    generic = min(
+        timeit.repeat(
+            lambda: [middle.asdict(i) for i in instances],
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    compiled = min(
+        timeit.repeat(
+            lambda: [serialize(i) for i in instances],
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    print("instances:       {}".format(args.size))
+    print("middle.asdict:   {:.3f}s".format(generic))
+    print("compiled:        {:.3f}s".format(compiled))
+    print("speedup:         {:.1f}x".format(generic / compiled))
+
+
+if __name__ == "__main__":
+    main()
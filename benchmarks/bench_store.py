@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from middle_schema.export import ComponentStore
+from middle_schema.export import dumps
+from middle_schema.export import export_store
+from middle_schema.openapi import OpenAPI
+
+
+def _api(size, fields):
+    return OpenAPI(
+        components={
+            "Model{}".format(i): {
+                "type": "object",
+                "properties": {
+                    "field_{}".format(j): {
+                        "type": "string",
+                        "description": "Field {} of model {}".format(j, i),
+                    }
+                    for j in range(fields)
+                },
+            }
+            for i in range(size)
+        },
+        specification={},
+    )
+
+
+def _timed(fn, number=1):
+    start = time.perf_counter()
+    for _ in range(number):
+        value = fn()
+    return value, (time.perf_counter() - start) * 1e3 / number
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Single component lookups: whole document against store"
+    )
+    parser.add_argument("--models", type=int, default=20000)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    api = _api(args.models, args.fields)
+    name = "Model{}".format(args.models // 2)
+    with tempfile.TemporaryDirectory() as directory:
+        document_path = os.path.join(directory, "openapi.json")
+        with open(document_path, "wb") as f:
+            f.write(dumps(api))
+        store_path = export_store(api, os.path.join(directory, "store.bin"))
+        print(
+            "sizes:             {} bytes (json), {} bytes (store)".format(
+                os.path.getsize(document_path), os.path.getsize(store_path)
+            )
+        )
+
+        def whole():
+            with open(document_path) as f:
+                return json.load(f)["components"][name]
+
+        def store():
+            with ComponentStore(store_path) as s:
+                return s[name]
+
+        expected, elapsed = _timed(whole, 5)
+        print("open + json.load:  {:.2f}ms".format(elapsed))
+        found, elapsed = _timed(store, 1000)
+        print("open + store:      {:.3f}ms".format(elapsed))
+        with ComponentStore(store_path) as s:
+            _, elapsed = _timed(lambda: s[name], 10000)
+        print("store lookup:      {:.4f}ms".format(elapsed))
+        assert found == expected
+
+
+if __name__ == "__main__":
+    main()
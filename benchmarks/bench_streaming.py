@@ -0,0 +1,73 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+import middle
+
+from middle_schema.openapi import iter_components
+from middle_schema.openapi import parse
+
+
+def _registry(size, fields):
+    models = []
+    for i in range(size):
+        attrs = {
+            "field_{}".format(j): middle.field(
+                type=str, description="Field {} of model {}".format(j, i)
+            )
+            for j in range(fields)
+        }
+        if i % 10:  # chains of 10 models
+            attrs["previous"] = middle.field(type=models[-1])
+        models.append(type("Model{}".format(i), (middle.Model,), attrs))
+    return type(
+        "Registry",
+        (middle.Model,),
+        {
+            "model_{}".format(i): middle.field(type=m)
+            for i, m in enumerate(models)
+        },
+    )
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def _whole(registry):
+    api = parse(registry)
+    return sum(len(json.dumps(s)) for s in api.components.values())
+
+
+def _streaming(registry):
+    return sum(len(json.dumps(s)) for _, s in iter_components(registry))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Peak memory of parse against iter_components"
+    )
+    parser.add_argument("--models", type=int, default=2000)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    registry = _registry(args.models, args.fields)
+    print("models:            {}".format(args.models))
+    for name, fn in (("parse", _whole), ("iter_components", _streaming)):
+        size, elapsed, peak = _measure(lambda: fn(registry))
+        print(
+            "{:<18} {:.1f}MB peak, {:.0f}ms ({} bytes)".format(
+                name + ":", peak / 2**20, elapsed * 1e3, size
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
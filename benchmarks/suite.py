@@ -0,0 +1,233 @@
+import argparse
+import datetime
+import enum
+import json
+import os
+import platform
+import sys
+import timeit
+import typing as t
+from decimal import Decimal
+
+import middle
+
+from middle_schema.openapi import parse
+from middle_schema.skel import translate
+
+_baseline = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# --------------------------------------------------------------------------- #
+# Models: a "real world" one, wide, deep and with shared references
+# --------------------------------------------------------------------------- #
+
+
+@enum.unique
+class PlatformEnum(str, enum.Enum):
+    XBOX1 = "XBOX1"
+    PLAYSTATION4 = "PLAYSTATION4"
+    PC = "PC"
+
+
+@enum.unique
+class LanguageEnum(enum.IntEnum):
+    ENGLISH = 1
+    JAPANESE = 2
+    SPANISH = 3
+
+
+class Player(middle.Model):
+    """A player, with its nickname and youtube channel"""
+
+    nickname = middle.field(type=str, min_length=3, description="The nick")
+    youtube_channel = middle.field(type=str, default=None)
+
+
+class Game(middle.Model):
+    """A game, with everything a game should have"""
+
+    name = middle.field(type=str, min_length=1, max_length=64)
+    platform = middle.field(type=PlatformEnum, description="The platform")
+    score = middle.field(type=float, minimum=0, maximum=10, multiple_of=0.1)
+    price = middle.field(type=Decimal, minimum=0)
+    resolution_tested = middle.field(type=str, pattern=r"^\d+x\d+$")
+    genre = middle.field(type=t.List[str], min_items=1, unique_items=True)
+    rating = middle.field(type=t.Dict[str, float], max_properties=5)
+    players = middle.field(type=t.Set[Player])
+    language = middle.field(type=LanguageEnum, description="The language")
+    released = middle.field(type=bool, default=True)
+    released_at = middle.field(type=datetime.date)
+    updated_at = middle.field(type=datetime.datetime, default=None)
+    favorite = middle.field(type=t.Union[Player, int])
+
+
+def _wide_model(size=1000):
+    attrs = {}
+    types = (str, int, float, bool, PlatformEnum, t.List[int])
+    for i in range(size):
+        attrs["field_{}".format(i)] = middle.field(
+            type=types[i % len(types)], description="Field {}".format(i)
+        )
+    return type("WideModel", (middle.Model,), attrs)
+
+
+def _deep_model(depth=50):
+    model = type(
+        "DeepModel0", (middle.Model,), {"value": middle.field(type=int)}
+    )
+    for i in range(1, depth):
+        model = type(
+            "DeepModel{}".format(i),
+            (middle.Model,),
+            {
+                "value": middle.field(type=int),
+                "child": middle.field(type=model),
+            },
+        )
+    return model
+
+
+def _shared_model(size=100):
+    attrs = {}
+    for i in range(size):
+        attrs["player_{}".format(i)] = middle.field(type=Player)
+        attrs["game_{}".format(i)] = middle.field(type=t.List[Game])
+    return type("SharedModel", (middle.Model,), attrs)
+
+
+# --------------------------------------------------------------------------- #
+# Cases
+# --------------------------------------------------------------------------- #
+
+
+def _parse_inline(model):
+    with middle.config.temp(
+        openapi_model_as_component=False, openapi_enum_as_component=False
+    ):
+        return parse(model)
+
+
+def _parse_components(model):
+    with middle.config.temp(
+        openapi_model_as_component=True, openapi_enum_as_component=True
+    ):
+        return parse(model)
+
+
+def _cases():
+    models = {
+        "game": Game,
+        "wide": _wide_model(),
+        "deep": _deep_model(),
+        "shared": _shared_model(),
+    }
+    cases = {}
+    for name, model in models.items():
+        cases["translate_{}".format(name)] = (translate, model)
+        cases["parse_inline_{}".format(name)] = (_parse_inline, model)
+        cases["parse_components_{}".format(name)] = (_parse_components, model)
+    return cases
+
+
+def _measure(fn, model, repeat):
+    fn(model)  # warm up dispatch caches
+    number, elapsed = 1, 0.0
+    while elapsed < 0.2:  # noqa at least 200ms per timing, for stability
+        number *= 2
+        elapsed = timeit.timeit(lambda: fn(model), number=number)
+    timings = timeit.repeat(lambda: fn(model), number=number, repeat=repeat)
+    return min(timings) / number
+
+
+# --------------------------------------------------------------------------- #
+# Baselines and reports
+# --------------------------------------------------------------------------- #
+
+
+def _environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "middle": middle.__version__,
+    }
+
+
+def _report(results, baseline, threshold):
+    regressions = []
+    print("{:<28} {:>12} {:>12} {:>8}".format("case", "baseline", "now", ""))
+    for name, seconds in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print("{:<28} {:>12} {:>10.3f}ms".format(name, "-", seconds * 1e3))
+            continue
+        ratio = seconds / before
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        print(
+            "{:<28} {:>10.3f}ms {:>10.3f}ms {:>6.2f}x {}".format(
+                name, before * 1e3, seconds * 1e3, ratio, flag
+            )
+        )
+    if baseline.get("environment") != _environment():
+        print(
+            "\nwarning: the baseline was recorded in a different "
+            "environment: {}".format(baseline.get("environment"))
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Schema generation benchmarks, compared to a baseline"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="", help="only run cases containing this text"
+    )
+    parser.add_argument("--baseline", default=_baseline)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 5000))
+    results = {}
+    for name, (fn, model) in sorted(_cases().items()):
+        if args.filter in name:
+            results[name] = _measure(fn, model, args.repeat)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {"environment": _environment(), "results": results},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print("baseline saved to {}".format(args.baseline))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = _report(results, baseline, args.threshold)
+    if regressions:
+        print("\nregressions: {}".format(", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -62,10 +62,9 @@ setup(
         "jsonschema",
         "schema",
     ],
-    install_requires=["middle>=0.2.0"],
-    extras_require={
-        # eg:
-        #   'rst': ['docutils>=0.11'],
-        #   ':python_version=="2.6"': ['argparse'],
+    install_requires=["middle>=0.2.0", 'contextvars;python_version<"3.7"'],
+    extras_require={"numpy": ["numpy>=1.15"]},
+    entry_points={
+        "console_scripts": ["middle-schema = middle_schema.cli:main"]
     },
 )
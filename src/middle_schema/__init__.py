@@ -6,11 +6,15 @@ import middle
 from middle.options import MetadataOption
 from middle.options import metadata_options
 
+from .metrics import reset_stats
+from .metrics import stats
+
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 metadata_options.append(MetadataOption(name="description", type_=str))
 
 middle.config.add_option("openapi_model_as_component", bool, True)
 middle.config.add_option("openapi_enum_as_component", bool, True)
+middle.config.add_option("openapi_minify", bool, False)
 
-__all__ = ()
+__all__ = ("stats", "reset_stats")
@@ -0,0 +1,139 @@
+import json
+
+import attr
+
+from .openapi import _component_name
+from .pointer import _escape
+
+_separators = (",", ":")
+_specification = "(specification)"
+
+# --------------------------------------------------------------------------- #
+# Size and complexity of the generated schemas
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class SchemaStats:
+    name = attr.ib(type=str)
+    size = attr.ib(type=int)
+    depth = attr.ib(type=int)
+    fan_out = attr.ib(type=int)
+    inbound_refs = attr.ib(type=int)
+    description_size = attr.ib(type=int)
+    largest_subtrees = attr.ib(type=list)
+
+    @property
+    def description_share(self):
+        if not self.size:
+            return 0.0
+        return self.description_size / self.size
+
+
+@attr.s
+class Analysis:
+    size = attr.ib(type=int)
+    schemas = attr.ib(type=list)
+
+    def format_report(self):
+        lines = [
+            "total size: {} bytes".format(self.size),
+            "",
+            "{:<32} {:>9} {:>6} {:>7} {:>7} {:>6}  {}".format(
+                "schema",
+                "bytes",
+                "depth",
+                "fan-out",
+                "inbound",
+                "descr",
+                "largest inline subtrees",
+            ),
+        ]
+        for s in self.schemas:
+            lines.append(
+                "{:<32} {:>9} {:>6} {:>7} {:>7} {:>5.0%}  {}".format(
+                    s.name,
+                    s.size,
+                    s.depth,
+                    s.fan_out,
+                    s.inbound_refs,
+                    s.description_share,
+                    ", ".join(
+                        "{} ({})".format(p, size)
+                        for p, size in s.largest_subtrees
+                    ),
+                )
+            )
+        return "\n".join(lines)
+
+
+def analyze(api, top=3):
+    schemas = dict(api.components)
+    schemas[_specification] = api.specification
+    inbound = {}
+    for schema in schemas.values():
+        for pointer, node, depth in _walk(schema):
+            if "$ref" in node:
+                inbound[node["$ref"]] = inbound.get(node["$ref"], 0) + 1
+    output = []
+    for name, schema in schemas.items():
+        output.append(_schema_stats(name, schema, inbound, top))
+    output.sort(key=lambda s: s.size, reverse=True)
+    return Analysis(size=_size(schemas), schemas=output)
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+
+
+def _size(value):
+    return len(json.dumps(value, separators=_separators).encode("utf-8"))
+
+
+def _walk(schema, pointer="", depth=1):
+    yield pointer, schema, depth
+    for key in ("items", "additionalProperties"):
+        if isinstance(schema.get(key), dict):
+            yield from _walk(
+                schema[key], "{}/{}".format(pointer, key), depth + 1
+            )
+    for key, child in schema.get("properties", {}).items():
+        yield from _walk(
+            child, "{}/properties/{}".format(pointer, _escape(key)), depth + 1
+        )
+    for i, child in enumerate(schema.get("anyOf", [])):
+        yield from _walk(child, "{}/anyOf/{}".format(pointer, i), depth + 1)
+
+
+def _schema_stats(name, schema, inbound, top):
+    depth, description_size, refs, subtrees = 0, 0, set(), []
+    for pointer, node, node_depth in _walk(schema):
+        depth = max(depth, node_depth)
+        if "$ref" in node:
+            refs.add(node["$ref"])
+        if "description" in node:
+            # the size of the whole '"description":"...",' member
+            description_size += _size(node["description"]) + 15
+        if pointer and "$ref" not in node:
+            subtrees.append((pointer, _size(node)))
+    subtrees.sort(key=lambda s: s[1], reverse=True)
+    return SchemaStats(
+        name=name,
+        size=_size(schema),
+        depth=depth,
+        fan_out=len(refs),
+        inbound_refs=inbound.get(_component_name(name), 0),
+        description_size=description_size,
+        largest_subtrees=_outermost(subtrees)[:top],
+    )
+
+
+def _outermost(subtrees):
+    # nested subtrees are always smaller than their parents, so only keep
+    # those not inside an already listed (bigger) subtree
+    output = []
+    for pointer, size in subtrees:
+        if not any(pointer.startswith(p + "/") for p, _ in output):
+            output.append((pointer, size))
+    return output
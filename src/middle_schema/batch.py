@@ -0,0 +1,205 @@
+from functools import partial
+
+import attr
+
+from .skel import as_skeleton
+from .utils import is_model
+from .validator import _is_multiple_of
+from .validator import compile_validator
+
+try:
+    import numpy as np
+except ImportError:  # noqa
+    np = None
+
+
+class _Missing:
+    pass
+
+
+_missing = _Missing()
+_NoneType = type(None)
+
+# --------------------------------------------------------------------------- #
+# Validate lists of payloads column-wise, using NumPy
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Column:
+    name = attr.ib(type=str)
+    kind = attr.ib()
+    rules = attr.ib(type=dict)
+    required = attr.ib(type=bool)
+    accepts_none = attr.ib(type=bool)
+
+
+def compile_batch_validator(model_or_skeleton):
+    if np is None:
+        raise ImportError(
+            "NumPy is required for batch validation, please install "
+            "middle-schema with the 'numpy' extra: "
+            "pip install middle-schema[numpy]"
+        )
+    skeleton = as_skeleton(model_or_skeleton)
+    if not is_model(skeleton.type):
+        raise TypeError("batch validation is only available for models")
+    columns, scalar = [], []
+    for child in skeleton.children:
+        rules = {}
+        if child.validator_data is not None:
+            rules = child.validator_data.rules or {}
+        kind = _column_kinds.get(child.type)
+        if kind is None or not set(rules).issubset(_vectorized_rules):
+            scalar.append(child)
+            continue
+        columns.append(
+            _Column(
+                name=child.name,
+                kind=kind,
+                rules=rules,
+                required=not child.nullable and not child.has_default_value,
+                accepts_none=child.nullable
+                or (child.has_default_value and child.default_value is None),
+            )
+        )
+    scalar_validator = None
+    if scalar:
+        scalar_validator = compile_validator(
+            attr.evolve(skeleton, children=scalar)
+        )
+    return partial(_validate_batch, columns, scalar_validator)
+
+
+def _validate_batch(columns, scalar_validator, records):
+    size = len(records)
+    is_dict = np.fromiter(
+        (isinstance(r, dict) for r in records), dtype=bool, count=size
+    )
+    rows = records
+    if not is_dict.all():
+        rows = [r if isinstance(r, dict) else {} for r in records]
+    invalid = ~is_dict
+    for column in columns:
+        values = [r.get(column.name, _missing) for r in rows]
+        invalid |= _check_column(column, values)
+    if scalar_validator is not None:
+        for index in np.flatnonzero(~invalid):
+            if scalar_validator(rows[index]):
+                invalid[index] = True
+    return invalid
+
+
+def _check_column(column, values):
+    kind = column.kind
+    if set(map(type, values)).issubset(kind.accepted):
+        # fast path: every single value has the expected type
+        return kind.rules(column.rules, values)
+    size = len(values)
+    types = np.fromiter(map(type, values), dtype=object, count=size)
+    skip = types == _Missing
+    invalid = np.zeros(size, dtype=bool)
+    if column.required:
+        invalid |= skip
+    if column.accepts_none:
+        skip |= types == _NoneType
+    valid_type = np.zeros(size, dtype=bool)
+    for type_ in kind.accepted:
+        valid_type |= types == type_
+    invalid |= ~(valid_type | skip)
+    if column.rules:
+        placeholder = kind.placeholder
+        invalid |= valid_type & kind.rules(
+            column.rules,
+            [v if ok else placeholder for v, ok in zip(values, valid_type)],
+        )
+    return invalid
+
+
+# --------------------------------------------------------------------------- #
+# Column kinds, with rules returning a boolean mask of invalid values
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Kind:
+    accepted = attr.ib(type=frozenset)
+    rules = attr.ib()
+    placeholder = attr.ib()
+
+
+def _number_rules(dtype, rules, values):
+    invalid = np.zeros(len(values), dtype=bool)
+    if not rules:
+        return invalid
+    try:
+        numbers = np.array(values, dtype=dtype)
+    except OverflowError:  # noqa too big for int64, compare as floats
+        numbers = np.array(values, dtype="float64")
+    if "minimum" in rules:
+        if rules.get("exclusive_minimum", False):
+            invalid |= numbers <= rules["minimum"]
+        else:
+            invalid |= numbers < rules["minimum"]
+    if "maximum" in rules:
+        if rules.get("exclusive_maximum", False):
+            invalid |= numbers >= rules["maximum"]
+        else:
+            invalid |= numbers > rules["maximum"]
+    if "multiple_of" in rules:
+        multiple_of = rules["multiple_of"]
+        if isinstance(multiple_of, float):
+            # checked (exactly, with decimals) by the compiled validator
+            # function, as any float tolerance would accept big values
+            invalid |= np.fromiter(
+                (not _is_multiple_of(v, multiple_of) for v in values),
+                dtype=bool,
+                count=len(values),
+            )
+        else:
+            invalid |= np.mod(numbers, multiple_of) != 0
+    return invalid
+
+
+def _str_rules(rules, values):
+    invalid = np.zeros(len(values), dtype=bool)
+    if not rules:
+        return invalid
+    lengths = np.fromiter(map(len, values), dtype="int64", count=len(values))
+    if "min_length" in rules:
+        invalid |= lengths < rules["min_length"]
+    if "max_length" in rules:
+        invalid |= lengths > rules["max_length"]
+    return invalid
+
+
+def _no_rules(rules, values):
+    return np.zeros(len(values), dtype=bool)
+
+
+_column_kinds = {
+    int: _Kind(
+        accepted=frozenset([int]),
+        rules=partial(_number_rules, "int64"),
+        placeholder=0,
+    ),
+    float: _Kind(
+        accepted=frozenset([int, float]),
+        rules=partial(_number_rules, "float64"),
+        placeholder=0,
+    ),
+    str: _Kind(accepted=frozenset([str]), rules=_str_rules, placeholder=""),
+    bool: _Kind(
+        accepted=frozenset([bool]), rules=_no_rules, placeholder=False
+    ),
+}
+
+_vectorized_rules = {
+    "minimum",
+    "maximum",
+    "exclusive_minimum",
+    "exclusive_maximum",
+    "multiple_of",
+    "min_length",
+    "max_length",
+}
@@ -0,0 +1,347 @@
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import EnumMeta
+
+import attr
+import middle
+
+from . import __version__
+from .export import _write
+from .export import dumps
+from .openapi import parse
+from .utils import is_model
+
+_state_file = ".middle-schema-state.json"
+
+# --------------------------------------------------------------------------- #
+# The ``middle-schema`` command
+# --------------------------------------------------------------------------- #
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="middle-schema",
+        description="Generate OpenAPI schemas out of middle models",
+    )
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        metavar="target",
+        help="models (as 'module:Model'), modules or packages",
+    )
+    parser.add_argument(
+        "-o", "--output", default=".", help="output directory (default: .)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--state",
+        default=None,
+        help="state file, to skip unchanged models (default: {} inside "
+        "the output directory)".format(_state_file),
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="build every model, even if unchanged",
+    )
+    parser.add_argument(
+        "--inline",
+        action="store_true",
+        help="generate models and enums inline, instead of components",
+    )
+    parser.add_argument(
+        "--minify", action="store_true", help="enable openapi_minify"
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="keep watching the source files, building what changes",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="seconds between each check on watch mode (default: 0.5)",
+    )
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    options = {
+        "openapi_model_as_component": not args.inline,
+        "openapi_enum_as_component": not args.inline,
+        "openapi_minify": args.minify,
+    }
+    try:
+        models = find_models(args.targets)
+    except (ImportError, AttributeError, TypeError) as e:
+        parser.error(str(e))
+
+    builder = Builder(
+        output=args.output,
+        options=options,
+        state_path=args.state or os.path.join(args.output, _state_file),
+        jobs=args.jobs,
+    )
+    builder.build(models, force=args.force)
+    if args.watch:
+        watcher = Watcher(targets=args.targets, builder=builder)
+        print("watching for changes, press CTRL+C to stop")
+        try:
+            watcher.run(args.interval)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+# --------------------------------------------------------------------------- #
+# Building models (in this or in other processes)
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class Builder:
+    output = attr.ib(type=str)
+    options = attr.ib(type=dict)
+    state_path = attr.ib(type=str)
+    jobs = attr.ib(type=int, default=1)
+
+    def build(self, models, force=False):
+        start = time.perf_counter()
+        state = {} if force else _load_state(self.state_path)
+        os.makedirs(self.output, exist_ok=True)
+        jobs, skipped = [], 0
+        for model in models:
+            key = _key(model)
+            fingerprint = _fingerprint(model, self.options)
+            path = os.path.join(self.output, "{}.json".format(key))
+            if state.get(key) == fingerprint and os.path.exists(path):
+                skipped += 1
+                continue
+            state[key] = fingerprint
+            jobs.append(
+                (model.__module__, model.__qualname__, path, self.options)
+            )
+        if jobs:
+            if self.jobs > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                    results = list(executor.map(_build_job, jobs))
+            else:
+                results = [_build_job(job) for job in jobs]
+            for (module, qualname, path, _), elapsed in zip(jobs, results):
+                print(
+                    "built {}:{} in {:.1f}ms".format(module, qualname, elapsed)
+                )
+        _write(
+            self.state_path,
+            json.dumps(state, indent=2, sort_keys=True).encode("utf-8"),
+        )
+        print(
+            "{} built, {} unchanged in {:.1f}ms".format(
+                len(jobs), skipped, (time.perf_counter() - start) * 1e3
+            )
+        )
+        return len(jobs), skipped
+
+
+def _build_job(job):
+    module_name, qualname, path, options = job
+    start = time.perf_counter()
+    model = _get_qualname(importlib.import_module(module_name), qualname)
+    api = parse(model, **options)
+    _write(path, dumps(api))
+    return (time.perf_counter() - start) * 1e3
+
+
+def _load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# --------------------------------------------------------------------------- #
+# Finding models
+# --------------------------------------------------------------------------- #
+
+
+def find_models(targets):
+    models = []
+    for target in targets:
+        for model in _find_target_models(target):
+            if model not in models:
+                models.append(model)
+    return models
+
+
+def _find_target_models(target):
+    module_name, _, qualname = target.partition(":")
+    module = importlib.import_module(module_name)
+    if qualname:
+        model = _get_qualname(module, qualname)
+        if not is_model(model):
+            raise TypeError("{} is not a middle model".format(target))
+        return [model]
+    modules = [module]
+    if hasattr(module, "__path__"):  # a package
+        for info in pkgutil.walk_packages(
+            module.__path__, prefix=module.__name__ + "."
+        ):
+            modules.append(importlib.import_module(info.name))
+    return [
+        value
+        for m in modules
+        for value in vars(m).values()
+        if is_model(value) and value.__module__ == m.__name__
+    ]
+
+
+def _get_qualname(module, qualname):
+    value = module
+    for name in qualname.split("."):
+        value = getattr(value, name)
+    return value
+
+
+# --------------------------------------------------------------------------- #
+# Fingerprints of models (their source and the source of what they use)
+# --------------------------------------------------------------------------- #
+
+
+def _key(model):
+    return "{}.{}".format(model.__module__, model.__qualname__)
+
+
+def _fingerprint(model, options):
+    digest = hashlib.sha256()
+    digest.update(__version__.encode("utf-8"))
+    digest.update(middle.__version__.encode("utf-8"))
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    for type_ in sorted(_used_types(model, set()), key=_key):
+        digest.update(_key(type_).encode("utf-8"))
+        digest.update(_source_digest(type_))
+    return digest.hexdigest()
+
+
+def _used_types(type_, seen):
+    if type_ in seen:
+        return seen
+    if is_model(type_):
+        seen.add(type_)
+        for field in attr.fields(type_):
+            _used_types(field.type, seen)
+    elif isinstance(type_, EnumMeta):
+        seen.add(type_)
+    else:  # noqa List, Dict, Union, etc
+        for arg in getattr(type_, "__args__", None) or ():
+            _used_types(arg, seen)
+    return seen
+
+
+_source_digests = {}
+
+
+def _source_digest(type_):
+    path = inspect.getsourcefile(type_)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _source_digests:
+        with open(path, "rb") as f:
+            _source_digests[key] = hashlib.sha256(f.read()).digest()
+    return _source_digests[key]
+
+
+# --------------------------------------------------------------------------- #
+# Watch mode, polling the source files for changes
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class Watcher:
+    targets = attr.ib(type=list)
+    builder = attr.ib(type=Builder)
+    _models = attr.ib(type=list, default=None)
+    _files = attr.ib(type=dict, default=None)
+
+    def __attrs_post_init__(self):
+        self._models = find_models(self.targets)
+        self._files = self._stat_files()
+
+    def run(self, interval):
+        while True:
+            time.sleep(interval)
+            self.poll()
+
+    def poll(self):
+        files = self._stat_files()
+        changed = {p for p, s in files.items() if self._files.get(p) != s}
+        self._files = files
+        if not changed:
+            return None
+        try:
+            for module in self._affected_modules(changed):
+                importlib.reload(module)
+            self._models = find_models(self.targets)
+        except Exception as e:  # noqa the user is still editing
+            print("error reloading models: {!r}".format(e))
+            return None
+        self._files = self._stat_files()
+        return self.builder.build(self._models)
+
+    def _stat_files(self):
+        files = {}
+        for model in self._models:
+            for type_ in _used_types(model, set()):
+                path = inspect.getsourcefile(type_)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    files[path] = None
+                else:
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _affected_modules(self, changed):
+        uses = {}
+        for model in self._models:
+            used = uses.setdefault(model.__module__, set())
+            used.update(t.__module__ for t in _used_types(model, set()))
+        affected = set()
+        for name, used in uses.items():
+            for used_name in used:
+                if _module_file(used_name) in changed:
+                    affected.update((name, used_name))
+        # modules are reloaded after the ones they use, to get new classes
+        ordered, visiting = [], set()
+
+        def visit(name):
+            if name in visiting or name in ordered or name not in affected:
+                return
+            visiting.add(name)
+            for used_name in sorted(uses.get(name, ())):
+                visit(used_name)
+            ordered.append(name)
+
+        for name in sorted(affected):
+            visit(name)
+        return [sys.modules[name] for name in ordered]
+
+
+def _module_file(name):
+    return inspect.getsourcefile(sys.modules[name])
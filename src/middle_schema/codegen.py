@@ -0,0 +1,61 @@
+import attr
+
+from .utils import is_model
+
+# --------------------------------------------------------------------------- #
+# Helpers to generate (and compile) straight-line Python code out of skeletons
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class Block:
+    lines = attr.ib(type=list, factory=list)
+
+    def line(self, level, text):
+        self.lines.append("{}{}".format("    " * level, text))
+
+    def mark(self):
+        return len(self.lines)
+
+    def close(self, level, mark):
+        if len(self.lines) == mark:  # an empty body is a syntax error
+            self.line(level, "pass")
+
+
+@attr.s
+class Source:
+    namespace = attr.ib(type=dict, factory=dict)
+    blocks = attr.ib(type=list, factory=list)
+    _constants = attr.ib(type=dict, factory=dict)
+    _counter = attr.ib(type=int, default=0)
+
+    def name(self, prefix="_v"):
+        self._counter += 1
+        return "{}{}".format(prefix, self._counter)
+
+    def function_name(self, skeleton, prefix):
+        if is_model(skeleton.type):
+            return self.name("{}_{}_".format(prefix, skeleton.type.__name__))
+        return self.name(prefix)
+
+    def const(self, value, prefix="_c"):
+        key = id(value)
+        if key not in self._constants:
+            name = self.name(prefix)
+            self.namespace[name] = value
+            # keep a reference to the value, so its id is never recycled
+            self._constants[key] = (name, value)
+        return self._constants[key][0]
+
+    def block(self):
+        block = Block()
+        self.blocks.append(block)
+        return block
+
+    @property
+    def text(self):
+        return "\n\n".join("\n".join(b.lines) for b in self.blocks) + "\n"
+
+    def compile(self, fn_name, filename="<middle_schema>"):
+        exec(compile(self.text, filename, "exec"), self.namespace)
+        return self.namespace[fn_name]
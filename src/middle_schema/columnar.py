@@ -0,0 +1,257 @@
+import datetime
+from decimal import Decimal
+from enum import EnumMeta
+
+import attr
+
+from .deserializer import _to_datetime
+from .deserializer import compile_deserializer
+from .skel import as_skeleton
+from .utils import is_model
+
+try:
+    import numpy as np
+except ImportError:  # noqa
+    np = None
+
+# --------------------------------------------------------------------------- #
+# NumPy structured (and columnar) representation of flat models
+# --------------------------------------------------------------------------- #
+
+
+def structured_dtype(model_or_skeleton):
+    return _get_layout(model_or_skeleton).dtype
+
+
+def to_structured(model_or_skeleton, items):
+    layout = _get_layout(model_or_skeleton)
+    array = np.empty(len(items), dtype=layout.dtype)
+    for name, column in _encode(layout, items).items():
+        array[name] = column
+    return array
+
+
+def from_structured(model_or_skeleton, array, as_dicts=False):
+    layout = _get_layout(model_or_skeleton)
+    return _decode(
+        layout, {f.name: array[f.name] for f in layout.fields}, as_dicts
+    )
+
+
+def to_columns(model_or_skeleton, items):
+    return _encode(_get_layout(model_or_skeleton), items)
+
+
+def from_columns(model_or_skeleton, columns, as_dicts=False):
+    return _decode(_get_layout(model_or_skeleton), columns, as_dicts)
+
+
+# --------------------------------------------------------------------------- #
+# Layouts
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Field:
+    name = attr.ib(type=str)
+    dtype = attr.ib()
+    encode = attr.ib()
+    decode = attr.ib()
+    default = attr.ib(default=None)
+
+
+@attr.s
+class _Layout:
+    skeleton = attr.ib()
+    fields = attr.ib(type=list)
+    dtype = attr.ib()
+    _deserializer = attr.ib(default=None)
+
+    @property
+    def deserializer(self):
+        if self._deserializer is None:
+            self._deserializer = compile_deserializer(
+                self.skeleton, validate=False
+            )
+        return self._deserializer
+
+
+_layouts = {}
+
+
+def _get_layout(model_or_skeleton):
+    if np is None:
+        raise ImportError(
+            "NumPy is required for columnar conversions, please install "
+            "middle-schema with the 'numpy' extra: "
+            "pip install middle-schema[numpy]"
+        )
+    if is_model(model_or_skeleton) and model_or_skeleton in _layouts:
+        return _layouts[model_or_skeleton]
+    skeleton = as_skeleton(model_or_skeleton)
+    if not is_model(skeleton.type):
+        raise TypeError("only models can be converted to structured arrays")
+    fields = [
+        attr.evolve(_field(child), default=_default(child))
+        for child in skeleton.children
+    ]
+    layout = _Layout(
+        skeleton=skeleton,
+        fields=fields,
+        dtype=np.dtype([(f.name, f.dtype) for f in fields]),
+    )
+    if is_model(model_or_skeleton):
+        _layouts[model_or_skeleton] = layout
+    return layout
+
+
+def _field(skeleton):
+    type_ = skeleton.type
+    if isinstance(type_, EnumMeta):
+        return _enum_field(skeleton)
+    if type_ is str:
+        rules = {}
+        if skeleton.validator_data is not None:
+            rules = skeleton.validator_data.rules or {}
+        if "max_length" not in rules:
+            raise TypeError(
+                "the field '{}' must declare a 'max_length' to be stored "
+                "as a fixed length string".format(skeleton.name)
+            )
+        return _Field(
+            name=skeleton.name,
+            dtype="U{}".format(rules["max_length"]),
+            encode=_identity,
+            decode=_to_list,
+        )
+    if type_ in _simple_fields:
+        dtype, encode, decode = _simple_fields[type_]
+        return _Field(
+            name=skeleton.name, dtype=dtype, encode=encode, decode=decode
+        )
+    raise TypeError(
+        "the field '{}' of type {!r} can't be stored on a structured "
+        "array, only flat models are supported".format(skeleton.name, type_)
+    )
+
+
+def _enum_field(skeleton):
+    members = list(skeleton.type)
+    codes = {}
+    for code, member in enumerate(members):
+        codes[member] = code
+        codes[member.value] = code
+    if len(members) <= 2**7:
+        dtype = "i1"
+    elif len(members) <= 2**15:
+        dtype = "i2"
+    else:
+        dtype = "i4"
+    return _Field(
+        name=skeleton.name,
+        dtype=dtype,
+        encode=lambda values: [codes[v] for v in values],
+        decode=lambda column: [members[c] for c in column.tolist()],
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Encoders and decoders
+# --------------------------------------------------------------------------- #
+
+
+def _identity(values):
+    return values
+
+
+def _to_list(column):
+    return column.tolist()
+
+
+def _encode_decimal(values):
+    return [float(v) for v in values]
+
+
+def _decode_decimal(column):
+    return [Decimal(repr(v)) for v in column.tolist()]
+
+
+def _encode_date(values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+def _decode_date(column):
+    return column.astype("datetime64[D]").astype(object).tolist()
+
+
+def _encode_datetime(values):
+    return np.array(
+        [
+            _to_datetime(v)
+            .astimezone(datetime.timezone.utc)
+            .replace(tzinfo=None)
+            for v in values
+        ],
+        dtype="datetime64[us]",
+    )
+
+
+def _decode_datetime(column):
+    return [
+        v.replace(tzinfo=datetime.timezone.utc)
+        for v in column.astype("datetime64[us]").astype(object).tolist()
+    ]
+
+
+_simple_fields = {
+    int: ("i8", _identity, _to_list),
+    float: ("f8", _identity, _to_list),
+    bool: ("?", _identity, _to_list),
+    Decimal: ("f8", _encode_decimal, _decode_decimal),
+    datetime.date: ("datetime64[D]", _encode_date, _decode_date),
+    datetime.datetime: ("datetime64[us]", _encode_datetime, _decode_datetime),
+}
+
+
+def _default(skeleton):
+    # a callable returning the default value of the field (if any), for
+    # dicts missing it
+    if not skeleton.has_default_value:
+        return None
+    default = skeleton.default_value
+    if isinstance(default, attr.Factory):
+        return None if default.takes_self else default.factory
+    return lambda: default
+
+
+def _get_item(item, field):
+    if field.name in item or field.default is None:
+        return item[field.name]
+    return field.default()
+
+
+def _get_attribute(item, field):
+    return getattr(item, field.name)
+
+
+def _encode(layout, items):
+    if items and isinstance(items[0], dict):
+        getter = _get_item
+    else:
+        getter = _get_attribute
+    return {
+        f.name: np.asarray(
+            f.encode([getter(i, f) for i in items]), dtype=f.dtype
+        )
+        for f in layout.fields
+    }
+
+
+def _decode(layout, columns, as_dicts):
+    names = [f.name for f in layout.fields]
+    values = [f.decode(np.asarray(columns[f.name])) for f in layout.fields]
+    records = [dict(zip(names, row)) for row in zip(*values)]
+    if as_dicts:
+        return records
+    deserialize = layout.deserializer
+    return [deserialize(r) for r in records]
@@ -0,0 +1,276 @@
+import copy
+import datetime
+import typing
+from decimal import Decimal
+from enum import EnumMeta
+
+import attr
+import middle
+from middle.converters import _date_converter
+from middle.converters import _datetime_converter
+from middle.dispatch import type_dispatch
+from middle.dtutils import dt_convert_to_utc
+from middle.exceptions import InvalidType
+from middle.exceptions import ValidationError
+from middle.model import ModelMeta
+
+from .codegen import Source
+from .skel import as_skeleton
+from .utils import is_model
+from .validator import compile_validator
+
+_missing = object()
+
+# --------------------------------------------------------------------------- #
+# Compile a primitive-to-model deserializer out of a skeleton
+# --------------------------------------------------------------------------- #
+
+
+def compile_deserializer(model_or_skeleton, validate=True):
+    skeleton = as_skeleton(model_or_skeleton)
+    builder = _Builder(source=_new_source())
+    fn_name = builder.function(skeleton)
+    block = builder.source.block()
+    block.line(0, "def deserialize(data):")
+    if validate:
+        validator = builder.source.const(compile_validator(skeleton))
+        block.line(1, "errors = {}(data)".format(validator))
+        block.line(1, "if errors:")
+        block.line(2, "raise _ValidationError(_error_message(errors[0]))")
+    block.line(1, "return {}(data)".format(fn_name))
+    return builder.source.compile(
+        "deserialize", "<middle_schema.deserializer>"
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions (available to the generated code)
+# --------------------------------------------------------------------------- #
+
+
+def _error_message(error):
+    path, message = error
+    if path:
+        return "'{}' {}".format(path, message)
+    return message
+
+
+def _to_decimal(value):
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _to_date(value):
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date(
+            int(value[0:4]), int(value[5:7]), int(value[8:10])
+        )
+    except (TypeError, ValueError):
+        return _date_converter(value)
+
+
+def _to_datetime(value):
+    if isinstance(value, str) and hasattr(datetime.datetime, "fromisoformat"):
+        try:
+            return dt_convert_to_utc(datetime.datetime.fromisoformat(value))
+        except ValueError:
+            pass
+    return _datetime_converter(value)
+
+
+def _new_source():
+    return Source(
+        namespace={
+            "_missing": _missing,
+            "_copy": copy.copy,
+            "_new": object.__new__,
+            "_ValidationError": ValidationError,
+            "_error_message": _error_message,
+            "_to_decimal": _to_decimal,
+            "_to_date": _to_date,
+            "_to_datetime": _to_datetime,
+        }
+    )
+
+
+# --------------------------------------------------------------------------- #
+# The code builder
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Builder:
+    source = attr.ib(type=Source)
+    _models = attr.ib(type=dict, factory=dict)
+
+    def function(self, skeleton):
+        if is_model(skeleton.type):
+            if skeleton.type in self._models:
+                return self._models[skeleton.type]
+            fn_name = self.source.function_name(skeleton, "_deserialize")
+            self._models[skeleton.type] = fn_name
+        else:
+            fn_name = self.source.function_name(skeleton, "_deserialize")
+        block = self.source.block()
+        block.line(0, "def {}(value):".format(fn_name))
+        if is_model(skeleton.type):
+            self._model_body(skeleton, block)
+        else:
+            block.line(
+                1, "return {}".format(self.expression(skeleton, "value"))
+            )
+        return fn_name
+
+    def expression(self, skeleton, value):
+        expression = _expression(skeleton.type, self, skeleton, value)
+        if expression != value and (
+            skeleton.nullable
+            or (skeleton.has_default_value and skeleton.default_value is None)
+        ):
+            return "None if {0} is None else {1}".format(value, expression)
+        return expression
+
+    def default(self, skeleton):
+        default = skeleton.default_value
+        if isinstance(default, attr.Factory):
+            if default.takes_self:
+                return "{}(obj)".format(self.source.const(default.factory))
+            return "{}()".format(self.source.const(default.factory))
+        if default is None or isinstance(default, (bool, int, float, str)):
+            return repr(default)
+        # mutable defaults (as lists or dicts) are copied, so instances never
+        # share them
+        return "_copy({})".format(self.source.const(default))
+
+    def _model_body(self, skeleton, block):
+        model = self.source.const(skeleton.type)
+        block.line(1, "if isinstance(value, {}):".format(model))
+        block.line(2, "return value")
+        block.line(1, "obj = _new({})".format(model))
+        fields = []
+        for child in skeleton.children:
+            value = self.source.name("_f")
+            if child.has_default_value or child.nullable:
+                block.line(
+                    1,
+                    "{} = value.get({!r}, _missing)".format(value, child.name),
+                )
+                block.line(1, "if {} is _missing:".format(value))
+                if child.has_default_value:
+                    block.line(2, "{} = {}".format(value, self.default(child)))
+                else:
+                    block.line(2, "{} = None".format(value))
+                block.line(1, "else:")
+                block.line(
+                    2, "{} = {}".format(value, self.expression(child, value))
+                )
+                fields.append((child.name, value))
+            else:
+                block.line(1, "{} = value[{!r}]".format(value, child.name))
+                fields.append((child.name, self.expression(child, value)))
+        block.line(1, "obj.__dict__.update({")
+        for name, expression in fields:
+            block.line(2, "{!r}: {},".format(name, expression))
+        block.line(1, "})")
+        if hasattr(skeleton.type, "__attrs_post_init__"):
+            block.line(1, "obj.__attrs_post_init__()")
+        block.line(1, "return obj")
+
+
+# --------------------------------------------------------------------------- #
+# Expressions for each type (every value given is a local name)
+# --------------------------------------------------------------------------- #
+
+
+@type_dispatch()
+def _expression(type_, builder, skeleton, value):
+    raise InvalidType()
+
+
+@_expression.register(middle.Model)
+@_expression.register(ModelMeta)
+def _expression_model(type_, builder, skeleton, value):
+    return "{}({})".format(builder.function(skeleton), value)
+
+
+@_expression.register(str)
+@_expression.register(bytes)
+@_expression.register(int)
+@_expression.register(bool)
+def _expression_primitive(type_, builder, skeleton, value):
+    return value
+
+
+@_expression.register(float)
+def _expression_float(type_, builder, skeleton, value):
+    return "float({})".format(value)
+
+
+@_expression.register(Decimal)
+def _expression_decimal(type_, builder, skeleton, value):
+    return "_to_decimal({})".format(value)
+
+
+@_expression.register(datetime.date)
+def _expression_date(type_, builder, skeleton, value):
+    return "_to_date({})".format(value)
+
+
+@_expression.register(datetime.datetime)
+def _expression_datetime(type_, builder, skeleton, value):
+    return "_to_datetime({})".format(value)
+
+
+@_expression.register(EnumMeta)
+def _expression_enum(type_, builder, skeleton, value):
+    return "{}({})".format(builder.source.const(type_), value)
+
+
+@_expression.register(typing.List)
+def _expression_list(type_, builder, skeleton, value):
+    item = builder.source.name("_item")
+    expression = builder.expression(skeleton.children[0], item)
+    if expression == item:
+        return "list({})".format(value)
+    return "[{} for {} in {}]".format(expression, item, value)
+
+
+@_expression.register(typing.Set)
+def _expression_set(type_, builder, skeleton, value):
+    item = builder.source.name("_item")
+    expression = builder.expression(skeleton.children[0], item)
+    if expression == item:
+        return "set({})".format(value)
+    return "{{{} for {} in {}}}".format(expression, item, value)
+
+
+@_expression.register(typing.Dict)
+def _expression_dict(type_, builder, skeleton, value):
+    key, item = builder.source.name("_k"), builder.source.name("_item")
+    expression = builder.expression(skeleton.children[0], item)
+    if expression == item:
+        return "dict({})".format(value)
+    return "{{{}: {} for {}, {} in {}.items()}}".format(
+        key, expression, key, item, value
+    )
+
+
+@_expression.register(typing.Union)
+def _expression_union(type_, builder, skeleton, value):
+    if skeleton.type_specific is None or not skeleton.type_specific.get(
+        "any_of", False
+    ):
+        return builder.expression(skeleton.children[0], value)
+    # the first branch accepting the value wins, as declared on the Union
+    fn_name = builder.source.name("_deserialize_union")
+    block = builder.source.block()
+    block.line(0, "def {}(value):".format(fn_name))
+    for child in skeleton.children:
+        validator = builder.source.const(compile_validator(child))
+        block.line(1, "if not {}(value):".format(validator))
+        block.line(2, "return {}".format(builder.expression(child, "value")))
+    block.line(1, "return value")
+    return "{}({})".format(fn_name, value)
@@ -0,0 +1,275 @@
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import attr
+
+from .openapi import OpenAPI
+from .openapi import _component_name
+
+_separators = (",", ":")
+_suffixes = {"identity": "", "gzip": ".gz", "deflate": ".zz"}
+
+# --------------------------------------------------------------------------- #
+# Export specifications, pre-compressed, for static file servers
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class Artifact:
+    path = attr.ib(type=str)
+    encoding = attr.ib(type=str)
+    length = attr.ib(type=int)
+    etag = attr.ib(type=str)
+
+
+def dumps(document):
+    if isinstance(document, OpenAPI):
+        document = attr.asdict(document)
+    return json.dumps(
+        document, separators=_separators, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def compress(data, encoding, level=9):
+    if encoding == "identity":
+        return data
+    elif encoding == "gzip":
+        buffer = io.BytesIO()
+        # a fixed mtime makes the output (and the etag) reproducible
+        with gzip.GzipFile(
+            fileobj=buffer, mode="wb", compresslevel=level, mtime=0
+        ) as f:
+            f.write(data)
+        return buffer.getvalue()
+    elif encoding == "deflate":
+        return zlib.compress(data, level)
+    raise ValueError(
+        "unknown encoding {!r}, use one of: {}".format(
+            encoding, ", ".join(sorted(_suffixes))
+        )
+    )
+
+
+def etag(data):
+    return '"{}"'.format(hashlib.sha256(data).hexdigest()[:32])
+
+
+def export(document, path, encodings=("gzip", "deflate"), level=9):
+    data = dumps(document)
+    artifacts = []
+    for encoding in ("identity",) + tuple(
+        e for e in encodings if e != "identity"
+    ):
+        output = compress(data, encoding, level)
+        artifact_path = path + _suffixes[encoding]
+        _write(artifact_path, output)
+        artifacts.append(
+            Artifact(
+                path=artifact_path,
+                encoding=encoding,
+                length=len(output),
+                etag=etag(output),
+            )
+        )
+    _write(
+        path + ".manifest.json",
+        json.dumps(
+            {
+                a.encoding: {
+                    "path": os.path.basename(a.path),
+                    "length": a.length,
+                    "etag": a.etag,
+                }
+                for a in artifacts
+            },
+            indent=2,
+            sort_keys=True,
+        ).encode("utf-8"),
+    )
+    return artifacts
+
+
+def _write(path, data):
+    # write and rename, so servers never read half written files
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# --------------------------------------------------------------------------- #
+# Export specifications split in many files
+# --------------------------------------------------------------------------- #
+
+
+def export_split(api, directory, group_by=None, workers=None):
+    if group_by is None:
+        group_by = _identity
+    groups = {}
+    for name in api.components:
+        groups.setdefault(group_by(name), []).append(name)
+    if "index" in groups:
+        raise ValueError(
+            "'index' can't be used as component or group name, as it is "
+            "reserved for the index file"
+        )
+    refs = {}
+    for group, names in groups.items():
+        for name in names:
+            if group_by is _identity:
+                refs[_component_name(name)] = "{}.json".format(group)
+            else:
+                refs[_component_name(name)] = "{}.json#/{}".format(group, name)
+    documents = {}
+    for group, names in groups.items():
+        if group_by is _identity:
+            document = api.components[names[0]]
+        else:
+            document = {name: api.components[name] for name in names}
+        documents["{}.json".format(group)] = _relocate(document, refs)
+    documents["index.json"] = {
+        "components": {
+            name: refs[_component_name(name)] for name in api.components
+        },
+        "specification": _relocate(api.specification, refs),
+    }
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, filename) for filename in documents]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(
+            executor.map(
+                lambda p, d: _write(p, dumps(d)), paths, documents.values()
+            )
+        )
+    return paths
+
+
+def _identity(value):
+    return value
+
+
+def _relocate(value, refs):
+    if isinstance(value, dict):
+        return {
+            k: refs.get(v, v)
+            if k == "$ref" and isinstance(v, str)
+            else _relocate(v, refs)
+            for k, v in value.items()
+        }
+    elif isinstance(value, list):
+        return [_relocate(v, refs) for v in value]
+    return value
+
+
+# --------------------------------------------------------------------------- #
+# Component stores: every component in one file, with a sorted index of names
+# and offsets, to get single components out of memory mapped files
+# --------------------------------------------------------------------------- #
+
+_store_magic = b"MSCS"
+_store_version = 1
+_store_header = struct.Struct("<4sHI")  # magic, version, count
+# offset and size of the name, then offset and size of the data
+_store_entry = struct.Struct("<QIQI")
+
+
+def export_store(api, path):
+    items = sorted(
+        (name.encode("utf-8"), dumps(schema))
+        for name, schema in api.components.items()
+    )
+    offset = _store_header.size + _store_entry.size * len(items)
+    index, blobs = [], []
+    for name, data in items:
+        index.append(
+            _store_entry.pack(offset, len(name), offset + len(name), len(data))
+        )
+        blobs.extend((name, data))
+        offset += len(name) + len(data)
+    _write(
+        path,
+        b"".join(
+            [_store_header.pack(_store_magic, _store_version, len(items))]
+            + index
+            + blobs
+        ),
+    )
+    return path
+
+
+class ComponentStore:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = _store_header.unpack_from(self._mmap)
+        if magic != _store_magic or version != _store_version:
+            self._mmap.close()
+            raise ValueError("{} is not a component store".format(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __iter__(self):
+        for i in range(self._count):
+            offset, size, _, _ = self._entry(i)
+            yield self._bytes(offset, size).decode("utf-8")
+
+    def __getitem__(self, name):
+        return json.loads(self.raw(name).decode("utf-8"))
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def raw(self, name):
+        # the (compact JSON) bytes of the component, as they are in the file
+        entry = self._find(name)
+        if entry is None:
+            raise KeyError(name)
+        _, _, offset, size = entry
+        return self._bytes(offset, size)
+
+    def close(self):
+        self._mmap.close()
+
+    def _entry(self, i):
+        return _store_entry.unpack_from(
+            self._mmap, _store_header.size + _store_entry.size * i
+        )
+
+    def _bytes(self, offset, size):
+        end = offset + size
+        return self._mmap[offset:end]
+
+    def _find(self, name):
+        key = name.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            i = (low + high) // 2
+            entry = self._entry(i)
+            found = self._bytes(entry[0], entry[1])
+            if found == key:
+                return entry
+            elif found < key:
+                low = i + 1
+            else:
+                high = i
+        return None
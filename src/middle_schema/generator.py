@@ -0,0 +1,425 @@
+import datetime
+import itertools
+import random
+import string
+import typing
+from decimal import Decimal
+from enum import EnumMeta
+from functools import partial
+
+import middle
+from middle.compat import get_type
+from middle.dispatch import type_dispatch
+from middle.exceptions import InvalidType
+from middle.model import ModelMeta
+
+from .skel import as_skeleton
+from .utils import is_model
+
+try:  # noqa
+    from re import _constants as sre_constants  # NOTE: internal to re
+    from re import _parser as sre_parse  # NOTE: internal to re
+except ImportError:  # noqa python < 3.11
+    import sre_constants
+    import sre_parse
+
+
+_epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_seconds_range = 60 * 365 * 24 * 60 * 60  # ~60 years after the epoch
+_printable = string.ascii_letters + string.digits + " _-."
+
+# --------------------------------------------------------------------------- #
+# Generate (streams of) synthetic payloads out of a skeleton
+# --------------------------------------------------------------------------- #
+
+
+def generate(model_or_skeleton, count=None, seed=None, invalid_ratio=0.0):
+    rnd = random.Random(seed)
+    skeleton = as_skeleton(model_or_skeleton)
+    valid = _generator(skeleton.type, skeleton, {})
+    corrupt = None
+    if invalid_ratio > 0:
+        corrupt = _corruptor(skeleton)
+    counter = itertools.count() if count is None else range(count)
+    for _ in counter:
+        value = valid(rnd)
+        if corrupt is not None and rnd.random() < invalid_ratio:
+            value = corrupt(rnd, value)
+        yield value
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+
+
+def _rules_of(skeleton):
+    if skeleton.validator_data is None:
+        return {}
+    return skeleton.validator_data.rules or {}
+
+
+def _accepts_none(skeleton):
+    return skeleton.nullable or (
+        skeleton.has_default_value and skeleton.default_value is None
+    )
+
+
+def _with_none(skeleton, fn):
+    if not _accepts_none(skeleton):
+        return fn
+
+    def inner(rnd):
+        if rnd.random() < 0.1:
+            return None
+        return fn(rnd)
+
+    return inner
+
+
+def _number_range(rules, span=1000):
+    if "minimum" in rules:
+        return rules["minimum"], rules.get("maximum", rules["minimum"] + span)
+    elif "maximum" in rules:
+        return rules["maximum"] - span, rules["maximum"]
+    return 0, span
+
+
+def _size_range(rules, lower_key, upper_key, default_span):
+    lower = rules.get(lower_key, 0)
+    upper = rules.get(upper_key, lower + default_span)
+    return lower, upper
+
+
+# --------------------------------------------------------------------------- #
+# Generators for each type
+# --------------------------------------------------------------------------- #
+
+
+def _child(skeleton, models):
+    return _with_none(skeleton, _generator(skeleton.type, skeleton, models))
+
+
+@type_dispatch()
+def _generator(type_, skeleton, models):
+    raise InvalidType()
+
+
+@_generator.register(middle.Model)
+@_generator.register(ModelMeta)
+def _generator_model(type_, skeleton, models):
+    if type_ in models:
+        return models[type_]
+    fields = []
+
+    def inner(rnd):
+        output = {}
+        for name, required, fn in fields:
+            if required or rnd.random() < 0.8:
+                output[name] = fn(rnd)
+        return output
+
+    models[type_] = inner
+    for c in skeleton.children:
+        required = not c.nullable and not c.has_default_value
+        fields.append((c.name, required, _child(c, models)))
+    return inner
+
+
+def _random_str(min_length, max_length, rnd):
+    size = rnd.randint(min_length, max_length)
+    return "".join(rnd.choice(string.ascii_letters) for _ in range(size))
+
+
+@_generator.register(str)
+@_generator.register(bytes)
+def _generator_str(type_, skeleton, models):
+    rules = _rules_of(skeleton)
+    if "pattern" in rules:
+        return _pattern_generator(rules["pattern"])
+    min_length, max_length = _size_range(rules, "min_length", "max_length", 16)
+    return partial(_random_str, min_length, max_length)
+
+
+def _random_int(minimum, maximum, multiple_of, rnd):
+    if multiple_of is None:
+        return rnd.randint(minimum, maximum)
+    lower = -(-minimum // multiple_of)
+    upper = maximum // multiple_of
+    return rnd.randint(lower, max(lower, upper)) * multiple_of
+
+
+@_generator.register(int)
+def _generator_int(type_, skeleton, models):
+    rules = _rules_of(skeleton)
+    minimum, maximum = _number_range(rules)
+    if rules.get("exclusive_minimum", False):
+        minimum = int(minimum // 1) + 1
+    if rules.get("exclusive_maximum", False):
+        maximum = -(-maximum // 1) - 1
+    multiple_of = rules.get("multiple_of")
+    if multiple_of is not None and not isinstance(multiple_of, int):
+        multiple_of = None  # noqa a fractional multiple for ints is useless
+    return partial(
+        _random_int, int(-(-minimum // 1)), int(maximum // 1), multiple_of
+    )
+
+
+def _random_float(minimum, maximum, multiple_of, digits, rnd):
+    if multiple_of is None:
+        value = rnd.uniform(minimum, maximum)
+        if value == minimum or value == maximum:  # noqa exclusive bounds
+            return (minimum + maximum) / 2
+        return value
+    lower = int(-(-minimum // multiple_of))
+    upper = int(maximum // multiple_of)
+    return round(rnd.randint(lower, max(lower, upper)) * multiple_of, digits)
+
+
+@_generator.register(float)
+def _generator_float(type_, skeleton, models):
+    rules = _rules_of(skeleton)
+    minimum, maximum = _number_range(rules)
+    multiple_of = rules.get("multiple_of")
+    digits = None
+    if multiple_of is not None:
+        exponent = Decimal(str(multiple_of)).as_tuple().exponent
+        digits = max(0, -exponent)
+        if rules.get("exclusive_minimum", False):
+            minimum += multiple_of
+        if rules.get("exclusive_maximum", False):
+            maximum -= multiple_of
+    return partial(_random_float, minimum, maximum, multiple_of, digits)
+
+
+@_generator.register(Decimal)
+def _generator_decimal(type_, skeleton, models):
+    fn = _generator_float(float, skeleton, models)
+    return lambda rnd: str(round(Decimal(repr(fn(rnd))), 6))
+
+
+@_generator.register(bool)
+def _generator_bool(type_, skeleton, models):
+    return lambda rnd: rnd.random() < 0.5
+
+
+def _random_datetime(rnd):
+    seconds = rnd.randint(0, _seconds_range)
+    return _epoch + datetime.timedelta(seconds=seconds)
+
+
+@_generator.register(datetime.date)
+def _generator_date(type_, skeleton, models):
+    return lambda rnd: _random_datetime(rnd).date().isoformat()
+
+
+@_generator.register(datetime.datetime)
+def _generator_datetime(type_, skeleton, models):
+    return lambda rnd: _random_datetime(rnd).isoformat()
+
+
+@_generator.register(EnumMeta)
+def _generator_enum(type_, skeleton, models):
+    choices = tuple(skeleton.type_specific.get("choices"))
+    return lambda rnd: rnd.choice(choices)
+
+
+def _random_list(fn, min_items, max_items, unique, rnd):
+    size = rnd.randint(min_items, max_items)
+    if not unique:
+        return [fn(rnd) for _ in range(size)]
+    output = []
+    for _ in range(size * 10):  # noqa there may be no enough unique values
+        if len(output) >= size:
+            break
+        value = fn(rnd)
+        if value not in output:
+            output.append(value)
+    return output
+
+
+@_generator.register(typing.List)
+@_generator.register(typing.Set)
+def _generator_iterable_set(type_, skeleton, models):
+    rules = _rules_of(skeleton)
+    min_items, max_items = _size_range(rules, "min_items", "max_items", 5)
+    unique = rules.get("unique_items", False) or get_type(type_) is typing.Set
+    return partial(
+        _random_list,
+        _child(skeleton.children[0], models),
+        min_items,
+        max_items,
+        unique,
+    )
+
+
+def _random_dict(fn, min_properties, max_properties, rnd):
+    size = rnd.randint(min_properties, max_properties)
+    return {"key{}".format(i): fn(rnd) for i in range(size)}
+
+
+@_generator.register(typing.Dict)
+def _generator_dict(type_, skeleton, models):
+    rules = _rules_of(skeleton)
+    min_properties, max_properties = _size_range(
+        rules, "min_properties", "max_properties", 3
+    )
+    return partial(
+        _random_dict,
+        _child(skeleton.children[0], models),
+        min_properties,
+        max_properties,
+    )
+
+
+@_generator.register(typing.Union)
+def _generator_union(type_, skeleton, models):
+    branches = [_child(c, models) for c in skeleton.children]
+    return lambda rnd: rnd.choice(branches)(rnd)
+
+
+# --------------------------------------------------------------------------- #
+# Strings out of regular expressions
+# --------------------------------------------------------------------------- #
+
+
+def _pattern_generator(pattern):
+    if not isinstance(pattern, str):
+        pattern = pattern.pattern
+    return _compile_pattern(sre_parse.parse(pattern))
+
+
+def _compile_pattern(subpattern):
+    parts = [_compile_node(op, av) for op, av in subpattern]
+    return lambda rnd: "".join(p(rnd) for p in parts)
+
+
+def _category_chars(category):
+    return {
+        sre_constants.CATEGORY_DIGIT: string.digits,
+        sre_constants.CATEGORY_WORD: string.ascii_letters + string.digits,
+        sre_constants.CATEGORY_SPACE: " ",
+    }.get(category)
+
+
+def _compile_in(items):
+    chars, negate = [], False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            chars.append(chr(av))
+        elif op == sre_constants.RANGE:
+            chars.extend(chr(c) for c in range(av[0], av[1] + 1))
+        elif op == sre_constants.CATEGORY and _category_chars(av):
+            chars.extend(_category_chars(av))
+        else:
+            raise ValueError(
+                "unsupported regular expression item for generation: "
+                "{} {}".format(op, av)
+            )
+    if negate:
+        chars = [c for c in _printable if c not in chars]
+    chars = "".join(sorted(set(chars)))
+    return lambda rnd: rnd.choice(chars)
+
+
+def _compile_repeat(av):
+    minimum, maximum, subpattern = av
+    if maximum == sre_constants.MAXREPEAT:
+        maximum = minimum + 5
+    fn = _compile_pattern(subpattern)
+    return lambda rnd: "".join(
+        fn(rnd) for _ in range(rnd.randint(minimum, maximum))
+    )
+
+
+def _compile_node(op, av):
+    if op == sre_constants.LITERAL:
+        return lambda rnd: chr(av)
+    elif op == sre_constants.NOT_LITERAL:
+        chars = "".join(c for c in _printable if c != chr(av))
+        return lambda rnd: rnd.choice(chars)
+    elif op == sre_constants.ANY:
+        return lambda rnd: rnd.choice(string.ascii_letters)
+    elif op == sre_constants.IN:
+        return _compile_in(av)
+    elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        return _compile_repeat(av)
+    elif op == sre_constants.SUBPATTERN:
+        return _compile_pattern(av[-1])
+    elif op == sre_constants.BRANCH:
+        branches = [_compile_pattern(b) for b in av[1]]
+        return lambda rnd: rnd.choice(branches)(rnd)
+    elif op == sre_constants.AT:
+        return lambda rnd: ""
+    raise ValueError(
+        "unsupported regular expression item for generation: "
+        "{} {}".format(op, av)
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Deliberately invalid payloads
+# --------------------------------------------------------------------------- #
+
+
+def _corruptor(skeleton):
+    candidates = []
+    if is_model(skeleton.type):
+        for c in skeleton.children:
+            if not c.nullable and not c.has_default_value:
+                candidates.append(partial(_drop_field, c.name))
+            if _accepts_wrong(c):
+                candidates.append(partial(_set_field, c.name, _wrong_value(c)))
+            for violation in _rule_violations(c):
+                candidates.append(partial(_set_field, c.name, violation))
+    if not candidates:
+        candidates.append(lambda rnd, value: _wrong_value(skeleton)())
+    return lambda rnd, value: rnd.choice(candidates)(rnd, value)
+
+
+def _drop_field(name, rnd, value):
+    value.pop(name, None)
+    return value
+
+
+def _set_field(name, wrong, rnd, value):
+    value[name] = wrong()
+    return value
+
+
+def _accepts_wrong(skeleton):
+    types = [skeleton.type]
+    if get_type(skeleton.type) is typing.Union:
+        types = [c.type for c in skeleton.children]
+    # there is always a wrong value, but not for unions of lists and others
+    return len(types) == 1 or not any(
+        get_type(t) in (typing.List, typing.Set) for t in types
+    )
+
+
+def _wrong_value(skeleton):
+    if get_type(skeleton.type) in (typing.List, typing.Set):
+        return lambda: "this is not an array"
+    return list  # every type, but arrays, rejects an (empty) array as value
+
+
+def _rule_violations(skeleton):
+    rules = _rules_of(skeleton)
+    violations = []
+    if "minimum" in rules:
+        violations.append(partial(_identity, rules["minimum"] - 1))
+    if "maximum" in rules:
+        violations.append(partial(_identity, rules["maximum"] + 1))
+    if rules.get("min_length", 0) > 0:
+        violations.append(partial(_identity, "a" * (rules["min_length"] - 1)))
+    if "max_length" in rules:
+        violations.append(partial(_identity, "a" * (rules["max_length"] + 1)))
+    if rules.get("min_items", 0) > 0:
+        violations.append(list)
+    return violations
+
+
+def _identity(value):
+    return value
@@ -0,0 +1,266 @@
+import datetime
+import enum
+import keyword
+import typing
+
+import attr
+import middle
+
+from .openapi import OpenAPI
+from .skel import translate
+from .utils import snake_to_camel_case
+
+_ref_prefixes = ("#/components/schemas/", "#/definitions/", "#/$defs/")
+_rules = {
+    snake_to_camel_case(name): name
+    for name in (
+        "min_length",
+        "max_length",
+        "pattern",
+        "minimum",
+        "maximum",
+        "exclusive_minimum",
+        "exclusive_maximum",
+        "multiple_of",
+        "min_items",
+        "max_items",
+        "unique_items",
+        "min_properties",
+        "max_properties",
+    )
+}
+_string_formats = {
+    "date": datetime.date,
+    "date-time": datetime.datetime,
+    "byte": bytes,
+}
+_simple_types = {"integer": int, "number": float, "boolean": bool}
+
+# --------------------------------------------------------------------------- #
+# Load models from OpenAPI (or JSON Schema) documents, lazily
+# --------------------------------------------------------------------------- #
+
+
+def load_models(document, module=None):
+    return ModelRegistry(
+        schemas=_find_schemas(document), module=module or __name__
+    )
+
+
+@attr.s
+class ModelRegistry:
+    schemas = attr.ib(type=dict)
+    module = attr.ib(type=str, default=__name__)
+    _types = attr.ib(type=dict, factory=dict)
+    _loading = attr.ib(type=list, factory=list)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                "no component named {!r} to load".format(name)
+            ) from None
+
+    def __getitem__(self, name):
+        # nothing is created until used, and then only once
+        if name not in self._types:
+            if name not in self.schemas:
+                raise KeyError(name)
+            if name in self._loading:
+                raise TypeError(
+                    "{} references itself ({}), which can't be represented "
+                    "by middle models".format(
+                        name, " -> ".join(self._loading + [name])
+                    )
+                )
+            self._loading.append(name)
+            try:
+                self._types[name] = self._load(name, self.schemas[name])
+            finally:
+                self._loading.pop()
+        return self._types[name]
+
+    def __contains__(self, name):
+        return name in self.schemas
+
+    def __iter__(self):
+        return iter(self.schemas)
+
+    def __len__(self):
+        return len(self.schemas)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.schemas))
+
+    @property
+    def loaded(self):
+        return list(self._types)
+
+    def skeleton(self, name):
+        return translate(self[name])
+
+    def _load(self, name, schema):
+        if "enum" in schema or "choices" in schema:
+            return _create_enum(name, schema, self.module)
+        elif _is_model_schema(schema):
+            return self._create_model(name, schema)
+        return self._get_type(name, schema)
+
+    def _create_model(self, name, schema):
+        attrs = {"__module__": self.module}
+        if schema.get("description") is not None:
+            attrs["__description__"] = schema["description"]
+        required = set(schema.get("required", ()))
+        for field_name, field_schema in schema.get("properties", {}).items():
+            if not _is_field_name(field_name):
+                raise TypeError(
+                    "the property {!r} of {} can't be the name of a field of "
+                    "middle models".format(field_name, name)
+                )
+            attrs[field_name] = self._create_field(
+                name + _camel_case(field_name),
+                field_schema,
+                field_name in required,
+            )
+        return type(name, (middle.Model,), attrs)
+
+    def _create_field(self, name, schema, required):
+        type_ = self._get_type(name, schema)
+        kwargs = {
+            _rules[k]: v
+            for k, v in schema.items()
+            if k in _rules and "$ref" not in schema
+        }
+        if schema.get("description") is not None:
+            kwargs["description"] = schema["description"]
+        if "default" in schema:
+            kwargs["default"] = _get_default(type_, schema["default"])
+        elif not required:
+            kwargs["default"] = None
+        if kwargs.get("default", ...) is None:
+            type_ = typing.Optional[type_]
+        return middle.field(type=type_, **kwargs)
+
+    def _get_type(self, name, schema):
+        if "$ref" in schema:
+            return self[_ref_name(schema["$ref"])]
+        elif "anyOf" in schema or "oneOf" in schema:
+            args = tuple(
+                self._get_type("{}{}".format(name, i), s)
+                for i, s in enumerate(schema.get("anyOf", schema.get("oneOf")))
+            )
+            type_ = typing.Union[args]
+        elif "enum" in schema or "choices" in schema:
+            type_ = _create_enum(name, schema, self.module)
+        elif schema.get("type") == "string":
+            type_ = _string_formats.get(schema.get("format"), str)
+        elif schema.get("type") in _simple_types:
+            type_ = _simple_types[schema["type"]]
+        elif schema.get("type") == "array":
+            item = self._get_type(name + "Item", schema["items"])
+            type_ = typing.List[item]
+        elif _is_model_schema(schema):
+            type_ = self._create_model(name, schema)
+        elif schema.get("type") == "object" and isinstance(
+            schema.get("additionalProperties"), dict
+        ):
+            value = self._get_type(
+                name + "Value", schema["additionalProperties"]
+            )
+            type_ = typing.Dict[str, value]
+        else:
+            raise TypeError(
+                "the schema of {} can't be represented by middle types: "
+                "{!r}".format(name, schema)
+            )
+        if schema.get("nullable", False):
+            type_ = typing.Optional[type_]
+        return type_
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+
+
+def _find_schemas(document):
+    if isinstance(document, OpenAPI):
+        return document.components
+    elif "openapi" in document or "swagger" in document:
+        if "definitions" in document:  # Swagger 2.0
+            return document["definitions"]
+        return document.get("components", {}).get("schemas", {})
+    elif "components" in document:  # the output of parse, as a dict
+        return document["components"]
+    elif "$defs" in document:
+        return document["$defs"]
+    elif "definitions" in document:
+        return document["definitions"]
+    raise ValueError(
+        "no components, definitions or $defs found in the document"
+    )
+
+
+def _ref_name(ref):
+    for prefix in _ref_prefixes:
+        if ref.startswith(prefix):
+            _, _, name = ref.partition(prefix)
+            return name.replace("~1", "/").replace("~0", "~")
+    raise ValueError("unsupported reference: {!r}".format(ref))
+
+
+def _camel_case(name):
+    return "".join(p[:1].upper() + p[1:] for p in name.split("_"))
+
+
+def _is_model_schema(schema):
+    # objects without properties nor additionalProperties are empty models
+    # (as the ones of parse with openapi_minify)
+    return schema.get("type") == "object" and (
+        "properties" in schema
+        or schema.get("additionalProperties", False) is False
+    )
+
+
+def _is_field_name(name):
+    # fields become arguments of the __init__ generated by attrs (along with
+    # self), so they must be valid (and not reserved) names
+    return (
+        name.isidentifier() and not keyword.iskeyword(name) and name != "self"
+    )
+
+
+def _create_enum(name, schema, module):
+    choices = schema.get("enum", schema.get("choices"))
+    members, used = [], set()
+    for i, value in enumerate(choices):
+        # values differing only in case (as "asc" and "ASC") would get the
+        # same name, so taken names fall back to VALUE_{i} (made unique)
+        member = _member_name(value)
+        if member is None or member in used:
+            member = "VALUE_{}".format(i)
+        while member in used:
+            member += "_"
+        used.add(member)
+        members.append((member, value))
+    return enum.Enum(name, members, module=module)
+
+
+def _member_name(value):
+    if (
+        isinstance(value, str)
+        and value.isidentifier()
+        and not keyword.iskeyword(value)
+        and not value.startswith("_")
+    ):
+        return value.upper()
+    return None
+
+
+def _get_default(type_, value):
+    if isinstance(type_, enum.EnumMeta) and value is not None:
+        return type_(value)
+    return value
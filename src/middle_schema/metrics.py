@@ -0,0 +1,60 @@
+import attr
+
+# --------------------------------------------------------------------------- #
+# Runtime counters of the schema generation
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Counters:
+    translate_calls = attr.ib(type=int, default=0)
+    translate_seconds = attr.ib(type=float, default=0.0)
+    nodes_translated = attr.ib(type=int, default=0)
+    parse_calls = attr.ib(type=int, default=0)
+    parse_seconds = attr.ib(type=float, default=0.0)
+    nodes_parsed = attr.ib(type=int, default=0)
+    components_emitted = attr.ib(type=int, default=0)
+
+
+counters = _Counters()
+
+_dispatchers = {}
+_dispatch_offsets = {}
+
+
+def watch_dispatcher(name, dispatcher):
+    _dispatchers[name] = dispatcher
+    _dispatch_offsets[name] = (0, 0)
+
+
+def stats():
+    output = attr.asdict(counters)
+    output["dispatch"] = {
+        name: _dispatch_stats(name) for name in sorted(_dispatchers)
+    }
+    return output
+
+
+def reset_stats():
+    for field in attr.fields(_Counters):
+        setattr(counters, field.name, field.default)
+    for name, dispatcher in _dispatchers.items():
+        info = _cache_info(dispatcher)
+        _dispatch_offsets[name] = (info.hits, info.misses)
+
+
+def _cache_info(dispatcher):
+    # NOTE: _get_fn_cache is internal to middle's dispatcher
+    return dispatcher._get_fn_cache.cache_info()
+
+
+def _dispatch_stats(name):
+    info = _cache_info(_dispatchers[name])
+    hits, misses = _dispatch_offsets[name]
+    hits, misses = info.hits - hits, info.misses - misses
+    return {
+        "resolutions": hits + misses,
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "cached_types": info.currsize,
+    }
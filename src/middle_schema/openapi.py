@@ -1,4 +1,5 @@
 import datetime
+import time
 import typing
 from decimal import Decimal
 from enum import EnumMeta
@@ -9,7 +10,12 @@ from middle.dispatch import type_dispatch
 from middle.exceptions import InvalidType
 from middle.model import ModelMeta
 
+from .metrics import counters
+from .metrics import watch_dispatcher
+from .options import get_option
+from .options import options
 from .skel import translate
+from .skel import translate_shallow
 from .utils import is_model
 from .utils import snake_to_camel_case
 
@@ -20,11 +26,66 @@ class OpenAPI:
     specification = attr.ib(default=dict)
 
 
-def parse(model_or_field):
-    specs, components = _parse_skeleton(translate(model_or_field), {})
+def parse(model_or_field, **kwargs):
+    if kwargs:
+        with options(**kwargs):
+            return parse(model_or_field)
+    skeleton = translate(model_or_field)
+    start = time.perf_counter()
+    try:
+        specs, components = _parse_skeleton(skeleton, {})
+    finally:
+        counters.parse_calls += 1
+        counters.parse_seconds += time.perf_counter() - start
     return OpenAPI(components=components, specification=specs)
 
 
+def iter_components(*models, **kwargs):
+    if not kwargs.get("openapi_model_as_component", True):
+        raise ValueError("models are always generated as components here")
+    kwargs["openapi_model_as_component"] = True
+    pending, seen, emitted = list(reversed(models)), set(), set()
+    while pending:
+        model = pending.pop()
+        if model in seen:
+            continue
+        seen.add(model)
+        with options(**kwargs):
+            skeleton = translate_shallow(model)
+            start = time.perf_counter()
+            try:
+                _, components = _parse_skeleton(skeleton, {})
+            finally:
+                counters.parse_calls += 1
+                counters.parse_seconds += time.perf_counter() - start
+        pending.extend(reversed(_referenced_models(skeleton, [])))
+        del skeleton  # noqa only names are kept from here
+        for name, schema in components.items():
+            if name not in emitted:
+                emitted.add(name)
+                yield name, schema
+
+
+def _referenced_models(skeleton, output):
+    for c in skeleton.children or ():
+        if is_model(c.type) and c.children is None:
+            output.append(c.type)
+        else:
+            _referenced_models(c, output)
+    return output
+
+
+# validator keywords that, with these values, mean the same as being absent
+_redundant_keywords = {
+    "minLength": 0,
+    "minItems": 0,
+    "minProperties": 0,
+    "exclusiveMinimum": False,
+    "exclusiveMaximum": False,
+    "uniqueItems": False,
+}
+
+
 def _component_name(name):
     return "#/components/schemas/{}".format(name)
 
@@ -32,10 +93,18 @@ def _component_name(name):
 def _get_validators(skeleton):
     if skeleton.name is not None and not is_model(skeleton.type):
         if skeleton.validator_data.rules is not None:
-            return {
+            output = {
                 snake_to_camel_case(k): v
                 for k, v in skeleton.validator_data.rules.items()
             }
+            if get_option("openapi_minify"):
+                output = {
+                    k: v
+                    for k, v in output.items()
+                    if k not in _redundant_keywords
+                    or v != _redundant_keywords[k]
+                }
+            return output
     return {}
 
 
@@ -47,10 +116,13 @@ def _merge_keywords(skeleton):
 
 
 def _parse_skeleton(skeleton, components):
+    counters.nodes_parsed += 1
     return _parse_type(skeleton.type, skeleton, components)
 
 
 def _parse_model(type_, skeleton, components):
+    if skeleton.children is None:  # noqa not translated (see iter_components)
+        return {"$ref": _component_name(type_.__name__)}, components
     children = {}
     for c in skeleton.children:
         o, components = _parse_skeleton(c, components)
@@ -68,8 +140,15 @@ def _parse_model(type_, skeleton, components):
     }
     if skeleton.description is not None:
         output["description"] = skeleton.description
-    if middle.config.openapi_model_as_component:
+    if get_option("openapi_minify"):
+        for key in ("properties", "required"):
+            if not output[key]:
+                del output[key]
+    if get_option("openapi_model_as_component") and not (
+        skeleton.type_specific or {}
+    ).get("inline", False):
         components[type_.__name__] = output
+        counters.components_emitted += 1
         output = {"$ref": _component_name(type_.__name__)}
     return output, components
 
@@ -79,6 +158,9 @@ def _parse_type(type_, skeleton, components):
     raise InvalidType()  # noqa will it get here after skel?
 
 
+watch_dispatcher("parse", _parse_type)
+
+
 @_parse_type.register(middle.Model)  # for recursive types
 @_parse_type.register(ModelMeta)  # for recursive types
 def _parse_model_meta(type_, skeleton, components):
@@ -138,15 +220,24 @@ def _parse_type_datetime(type_, skeleton, components):
 
 @_parse_type.register(EnumMeta)
 def _parse_type_enum(type_, skeleton, components):
+    if get_option("openapi_enum_as_component"):
+        # every enum component is generated only once
+        if type_.__name__ not in components:
+            output, components = _parse_enum(type_, skeleton, components)
+            output.pop("description", None)
+            components[type_.__name__] = output
+            counters.components_emitted += 1
+        output = {"$ref": _component_name(type_.__name__)}
+        if skeleton.description is not None:
+            output["description"] = skeleton.description
+        return output, components
+    return _parse_enum(type_, skeleton, components)
+
+
+def _parse_enum(type_, skeleton, components):
     choices = skeleton.type_specific.get("choices")
     output, components = _parse_type(type(choices[0]), skeleton, components)
-    output["choices"] = choices
-    if middle.config.openapi_enum_as_component:
-        description = output.pop("description")
-        components[type_.__name__] = output
-        output = {"$ref": _component_name(type_.__name__)}
-        if description is not None:
-            output["description"] = description
+    output["choices"] = list(choices)
     return output, components
 
 
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import middle
+
+# --------------------------------------------------------------------------- #
+# Context-local options, overriding the global configuration (middle.config)
+# --------------------------------------------------------------------------- #
+
+OPTIONS = (
+    "openapi_model_as_component",
+    "openapi_enum_as_component",
+    "openapi_minify",
+)
+
+_options = ContextVar("middle_schema_options", default=None)
+
+
+def get_option(name):
+    options = _options.get()
+    if options is not None and name in options:
+        return options[name]
+    return getattr(middle.config, name)
+
+
+@contextmanager
+def options(**kwargs):
+    for name, value in kwargs.items():
+        if name not in OPTIONS:
+            raise TypeError("unknown option: {!r}".format(name))
+        if not isinstance(value, bool):
+            raise TypeError(
+                "the option {!r} must be a boolean, not {!r}".format(
+                    name, value
+                )
+            )
+    token = _options.set({**(_options.get() or {}), **kwargs})
+    try:
+        yield
+    finally:
+        _options.reset(token)
@@ -0,0 +1,187 @@
+from urllib.parse import unquote
+
+import attr
+
+from .openapi import OpenAPI
+
+# --------------------------------------------------------------------------- #
+# Index of every JSON Pointer of a document, to resolve $ref in constant time
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class PointerIndex:
+    document = attr.ib()
+    _nodes = attr.ib(type=dict, factory=dict)
+    _resolved = attr.ib(type=dict, factory=dict)
+
+    def __attrs_post_init__(self):
+        self._index(self.document, "")
+
+    def __getitem__(self, pointer):
+        return self._nodes[_normalize(pointer)]
+
+    def __contains__(self, pointer):
+        return _normalize(pointer) in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def get(self, pointer, default=None):
+        return self._nodes.get(_normalize(pointer), default)
+
+    def resolve(self, node_or_ref):
+        # follows a $ref (and the $ref it points to, if any) up to a node
+        # that is not a reference, returning it
+        if isinstance(node_or_ref, dict):
+            if "$ref" not in node_or_ref:
+                return node_or_ref
+            ref = node_or_ref["$ref"]
+        else:
+            ref = node_or_ref
+        if ref not in self._resolved:
+            chain = [ref]
+            node = self._target(ref)
+            while isinstance(node, dict) and "$ref" in node:
+                if node["$ref"] in chain:
+                    raise ValueError(
+                        "circular reference: {}".format(
+                            " -> ".join(chain + [node["$ref"]])
+                        )
+                    )
+                chain.append(node["$ref"])
+                node = self._target(node["$ref"])
+            for r in chain:
+                self._resolved[r] = node
+        return self._resolved[ref]
+
+    def _target(self, ref):
+        if not ref.startswith("#"):
+            raise ValueError(
+                "only references inside the document can be resolved, not "
+                "{!r}".format(ref)
+            )
+        try:
+            return self[ref]
+        except KeyError:
+            raise KeyError(
+                "unresolvable reference: {!r}".format(ref)
+            ) from None
+
+    def _index(self, node, pointer):
+        self._nodes[pointer] = node
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self._index(value, "{}/{}".format(pointer, _escape(key)))
+        elif isinstance(node, list):
+            for i, value in enumerate(node):
+                self._index(value, "{}/{}".format(pointer, i))
+
+
+def index_document(document):
+    if isinstance(document, OpenAPI):
+        # the same layout of OpenAPI documents, as $ref of components point to
+        # #/components/schemas/{name}
+        document = {
+            "components": {"schemas": document.components},
+            "specification": document.specification,
+        }
+    return PointerIndex(document)
+
+
+# --------------------------------------------------------------------------- #
+# Dereferencing documents, inlining every $ref but the ones closing cycles
+# --------------------------------------------------------------------------- #
+
+
+def dereference(document):
+    deref = _Dereferencer(index_document(document))
+    if not isinstance(document, OpenAPI):
+        return deref.inline(document)
+    specification = deref.inline(document.specification)
+    # components referenced by the $ref left (on cycles) are kept, inlined
+    components, done = {}, set()
+    while deref.kept - done:
+        ref = min(deref.kept - done)
+        done.add(ref)
+        _, _, name = _normalize(ref).partition("/components/schemas/")
+        components[_unescape(name)] = deref.inline({"$ref": ref})
+    return OpenAPI(components=components, specification=specification)
+
+
+@attr.s
+class _Dereferencer:
+    index = attr.ib(type=PointerIndex)
+    kept = attr.ib(type=set, factory=set)
+    _memo = attr.ib(type=dict, factory=dict)
+    _stack = attr.ib(type=list, factory=list)
+    _open = attr.ib(type=list, factory=list)
+
+    def inline(self, node):
+        # nodes without any $ref inside are returned as they are (and not
+        # copied), so are shared between the input and the output
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return self._inline_ref(node)
+            output = {k: self.inline(v) for k, v in node.items()}
+            if all(output[k] is v for k, v in node.items()):
+                return node
+            return output
+        elif isinstance(node, list):
+            output = [self.inline(v) for v in node]
+            if all(o is v for o, v in zip(output, node)):
+                return node
+            return output
+        return node
+
+    def _inline_ref(self, node):
+        ref = node["$ref"]
+        target = self.index.resolve(ref)
+        key = id(target)
+        if key in self._stack:  # a cycle, so the $ref stays
+            self.kept.add(ref)
+            # the output of every component between the one referenced and
+            # this one depends on where it is inlined from now on
+            for i in range(self._stack.index(key) + 1, len(self._stack)):
+                self._open[i].add(key)
+            return node
+        if key in self._memo:
+            return self._with_siblings(self._memo[key], node)
+        self._stack.append(key)
+        self._open.append(set())
+        try:
+            output = self.inline(target)
+        finally:
+            self._stack.pop()
+            open_ = self._open.pop()
+        if not open_:
+            self._memo[key] = output
+        return self._with_siblings(output, node)
+
+    def _with_siblings(self, output, node):
+        if len(node) == 1:
+            return output
+        return {
+            **output,
+            **{k: self.inline(v) for k, v in node.items() if k != "$ref"},
+        }
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+
+
+def _escape(key):
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(key):
+    return key.replace("~1", "/").replace("~0", "~")
+
+
+def _normalize(pointer):
+    # references are URIs, so pointers in fragments may be percent-encoded
+    if pointer.startswith("#"):
+        return unquote(pointer[1:])
+    return pointer
@@ -0,0 +1,173 @@
+import json
+import time
+from contextlib import contextmanager
+
+import attr
+from attr._make import Attribute  # NOTE: this is internal to attrs
+
+from . import openapi
+from . import skel
+
+# --------------------------------------------------------------------------- #
+# Per-node profiling of the translate and parse pipelines
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class Event:
+    phase = attr.ib(type=str)
+    handler = attr.ib(type=str)
+    path = attr.ib(type=str)
+    start = attr.ib(type=float)
+    elapsed = attr.ib(type=float)
+    own = attr.ib(type=float)
+
+
+@attr.s
+class Profiler:
+    events = attr.ib(type=list, factory=list)
+    _stack = attr.ib(type=list, factory=list)
+    _origin = attr.ib(type=float, factory=time.perf_counter)
+
+    def report(self):
+        # sorted by the time spent on handlers themselves, without children
+        rows = {}
+        for event in self.events:
+            key = (event.phase, event.handler)
+            if key not in rows:
+                rows[key] = {
+                    "phase": event.phase,
+                    "handler": event.handler,
+                    "calls": 0,
+                    "total": 0.0,
+                    "own": 0.0,
+                    "slowest": None,
+                }
+            row = rows[key]
+            row["calls"] += 1
+            row["total"] += event.elapsed
+            row["own"] += event.own
+            if row["slowest"] is None or event.own > row["slowest"].own:
+                row["slowest"] = event
+        for row in rows.values():
+            row["slowest"] = row["slowest"].path
+        return sorted(rows.values(), key=lambda r: r["own"], reverse=True)
+
+    def format_report(self):
+        lines = [
+            "{:<10} {:<34} {:>7} {:>10} {:>10}  {}".format(
+                "phase", "handler", "calls", "total ms", "own ms", "slowest"
+            )
+        ]
+        for row in self.report():
+            lines.append(
+                "{:<10} {:<34} {:>7} {:>10.3f} {:>10.3f}  {}".format(
+                    row["phase"],
+                    row["handler"],
+                    row["calls"],
+                    row["total"] * 1e3,
+                    row["own"] * 1e3,
+                    row["slowest"],
+                )
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        return {
+            "traceEvents": [
+                {
+                    "name": event.handler,
+                    "cat": event.phase,
+                    "ph": "X",
+                    "ts": (event.start - self._origin) * 1e6,
+                    "dur": event.elapsed * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": {"path": event.path},
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def dump_chrome_trace(self, fp):
+        json.dump(self.chrome_trace(), fp)
+
+    def _enter(self, segment):
+        path = segment
+        if self._stack:
+            path = "{}.{}".format(self._stack[-1][0], segment)
+        frame = [path, 0.0]
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame, phase, handler, start, elapsed):
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] += elapsed
+        self.events.append(
+            Event(
+                phase=phase,
+                handler=handler,
+                path=frame[0],
+                start=start,
+                elapsed=elapsed,
+                own=elapsed - frame[1],
+            )
+        )
+
+
+@contextmanager
+def profile(profiler=None):
+    # hooks only exist inside the context: no cost at all when disabled
+    if profiler is None:
+        profiler = Profiler()
+    translate_type, parse_type = skel._translate_type, openapi._parse_type
+    skel._translate_type = _Hook(
+        translate_type, profiler, "translate", _translate_segment
+    )
+    openapi._parse_type = _Hook(parse_type, profiler, "parse", _parse_segment)
+    try:
+        yield profiler
+    finally:
+        skel._translate_type, openapi._parse_type = translate_type, parse_type
+
+
+# --------------------------------------------------------------------------- #
+# Hooks around the dispatchers
+# --------------------------------------------------------------------------- #
+
+
+def _type_name(type_):
+    return getattr(type_, "__name__", None) or str(type_)
+
+
+def _translate_segment(type_, model_or_field):
+    if isinstance(model_or_field, Attribute):
+        return model_or_field.name
+    return _type_name(type_)
+
+
+def _parse_segment(type_, skeleton, components):
+    if skeleton.name is not None:
+        return skeleton.name
+    return _type_name(type_)
+
+
+@attr.s(cmp=False)
+class _Hook:
+    dispatcher = attr.ib()
+    profiler = attr.ib(type=Profiler)
+    phase = attr.ib(type=str)
+    segment = attr.ib()
+
+    def __call__(self, *args):
+        # NOTE: _get_fn_cache is internal to middle's dispatcher
+        handler = self.dispatcher._get_fn_cache(args[0]).__name__
+        frame = self.profiler._enter(self.segment(*args))
+        start = time.perf_counter()
+        try:
+            return self.dispatcher(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.profiler._exit(frame, self.phase, handler, start, elapsed)
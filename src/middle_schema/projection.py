@@ -0,0 +1,106 @@
+import weakref
+
+import attr
+
+from .openapi import OpenAPI
+from .openapi import _parse_skeleton
+from .options import OPTIONS
+from .options import get_option
+from .options import options
+from .skel import translate
+from .utils import is_model
+
+# --------------------------------------------------------------------------- #
+# Schemas of models restricted to some of their fields (field masks)
+# --------------------------------------------------------------------------- #
+
+_missing = object()
+_skeletons = weakref.WeakKeyDictionary()
+_projections = weakref.WeakKeyDictionary()
+
+
+def project(model, fields, **kwargs):
+    if kwargs:
+        with options(**kwargs):
+            return project(model, fields)
+    mask = _parse_mask(fields)
+    key = (_freeze(mask), tuple(get_option(name) for name in OPTIONS))
+    projections = _projections.setdefault(model, {})
+    if key not in projections:
+        skeleton = _project(_get_skeleton(model), mask, model.__name__)
+        specs, components = _parse_skeleton(skeleton, {})
+        projections[key] = OpenAPI(components=components, specification=specs)
+    return projections[key]
+
+
+def _get_skeleton(model):
+    # the translated model is shared by every projection of it, as only the
+    # (restricted) models on the way to the selected fields are copied
+    minify = get_option("openapi_minify")
+    skeletons = _skeletons.setdefault(model, {})
+    if minify not in skeletons:
+        skeletons[minify] = translate(model)
+    return skeletons[minify]
+
+
+def _parse_mask(fields):
+    if isinstance(fields, str):
+        raise TypeError("fields must be a list of paths, not a string")
+    mask = {}
+    for path in fields:
+        node = mask
+        names = path.split(".")
+        for i, name in enumerate(names):
+            if node.get(name, _missing) is None:
+                break  # noqa the whole field was already selected
+            elif i == len(names) - 1:
+                node[name] = None
+            else:
+                node = node.setdefault(name, {})
+    if not mask:
+        raise ValueError("at least one field must be selected")
+    return mask
+
+
+def _freeze(mask):
+    return frozenset(
+        (name, None if sub is None else _freeze(sub))
+        for name, sub in mask.items()
+    )
+
+
+def _project(skeleton, mask, path):
+    if is_model(skeleton.type):
+        children = {c.name: c for c in skeleton.children}
+        for name in mask:
+            if name not in children:
+                raise ValueError(
+                    "{} has no field named {!r}".format(path, name)
+                )
+        return attr.evolve(
+            skeleton,
+            children=[
+                c
+                if mask[c.name] is None
+                else _project(c, mask[c.name], "{}.{}".format(path, c.name))
+                for c in skeleton.children
+                if c.name in mask
+            ],
+            type_specific={**(skeleton.type_specific or {}), "inline": True},
+        )
+    elif skeleton.children and any(map(_has_model, skeleton.children)):
+        # lists, sets, dicts and unions of models
+        return attr.evolve(
+            skeleton,
+            children=[
+                _project(c, mask, path) if _has_model(c) else c
+                for c in skeleton.children
+            ],
+        )
+    raise ValueError("{} has no fields to select".format(path))
+
+
+def _has_model(skeleton):
+    return is_model(skeleton.type) or any(
+        map(_has_model, skeleton.children or ())
+    )
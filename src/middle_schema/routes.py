@@ -0,0 +1,141 @@
+import inspect
+import typing
+
+import attr
+
+from .openapi import OpenAPI
+from .openapi import parse
+from .utils import is_model
+
+_methods = ("GET", "PUT", "POST", "DELETE", "OPTIONS", "HEAD", "PATCH")
+
+# --------------------------------------------------------------------------- #
+# Schemas of routes, out of the annotations of their handlers, generated only
+# when first used
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class RouteSchema:
+    method = attr.ib(type=str)
+    path = attr.ib(type=str)
+    request = attr.ib(type=OpenAPI, default=None)
+    response = attr.ib(type=OpenAPI, default=None)
+    description = attr.ib(type=str, default=None)
+
+    def operation(self):
+        output = {}
+        if self.description is not None:
+            output["description"] = self.description
+        if self.request is not None:
+            output["requestBody"] = {
+                "content": _json_content(self.request.specification),
+                "required": True,
+            }
+        if self.response is not None:
+            output["responses"] = {
+                "200": {
+                    "description": "",
+                    "content": _json_content(self.response.specification),
+                }
+            }
+        else:
+            output["responses"] = {"204": {"description": ""}}
+        return output
+
+
+@attr.s
+class Routes:
+    options = attr.ib(type=dict, factory=dict)
+    _handlers = attr.ib(type=dict, factory=dict)
+    _schemas = attr.ib(type=dict, factory=dict)
+
+    def add(self, path, handler, methods=("GET",)):
+        # only the handler is kept here, so adding routes costs nothing
+        for method in methods:
+            method = method.upper()
+            if method not in _methods:
+                raise ValueError("unknown method: {!r}".format(method))
+            self._handlers[(method, path)] = handler
+            self._schemas.pop((method, path), None)
+        return handler
+
+    def route(self, path, methods=("GET",)):
+        def decorator(handler):
+            return self.add(path, handler, methods)
+
+        return decorator
+
+    def __len__(self):
+        return len(self._handlers)
+
+    def __iter__(self):
+        return iter(self._handlers)
+
+    @property
+    def generated(self):
+        return list(self._schemas)
+
+    def schema(self, method, path):
+        key = (method.upper(), path)
+        if key not in self._schemas:
+            self._schemas[key] = self._generate(key, self._handlers[key])
+        return self._schemas[key]
+
+    def document(self):
+        # every route is generated, for complete specifications
+        paths, components = {}, {}
+        for method, path in self._handlers:
+            schema = self.schema(method, path)
+            paths.setdefault(path, {})[method.lower()] = schema.operation()
+            for api in (schema.request, schema.response):
+                if api is not None:
+                    components.update(api.components)
+        return {"paths": paths, "components": {"schemas": components}}
+
+    def _generate(self, key, handler):
+        method, path = key
+        request, response = _handler_types(handler)
+        return RouteSchema(
+            method=method,
+            path=path,
+            request=self._parse(request),
+            response=self._parse(response),
+            description=inspect.getdoc(handler),
+        )
+
+    def _parse(self, type_):
+        if type_ is None:
+            return None
+        return parse(type_, **self.options)
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions
+# --------------------------------------------------------------------------- #
+
+
+def _json_content(specification):
+    return {"application/json": {"schema": specification}}
+
+
+def _handler_types(handler):
+    # the first argument with a model (or a list or dict of models) is taken
+    # as the request body, and the return annotation as the response (if it
+    # has a model as well, not being the response class of a framework)
+    hints = typing.get_type_hints(handler)
+    request = None
+    for name in inspect.signature(handler).parameters:
+        if name in hints and _has_model(hints[name]):
+            request = hints[name]
+            break
+    response = hints.get("return")
+    if response is not None and not _has_model(response):
+        response = None
+    return request, response
+
+
+def _has_model(type_):
+    return is_model(type_) or any(
+        map(_has_model, getattr(type_, "__args__", None) or ())
+    )
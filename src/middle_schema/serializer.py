@@ -0,0 +1,203 @@
+import datetime
+import typing
+from decimal import Decimal
+from enum import EnumMeta
+
+import attr
+import middle
+from middle.compat import get_type
+from middle.dispatch import type_dispatch
+from middle.dtutils import dt_to_iso_string
+from middle.exceptions import InvalidType
+from middle.model import ModelMeta
+
+from .codegen import Source
+from .skel import as_skeleton
+from .utils import is_model
+
+# --------------------------------------------------------------------------- #
+# Compile a model-to-primitive serializer out of a skeleton
+# --------------------------------------------------------------------------- #
+
+
+def compile_serializer(model_or_skeleton, decimal=float):
+    skeleton = as_skeleton(model_or_skeleton)
+    builder = _Builder(source=_new_source(decimal))
+    fn_name = builder.function(skeleton)
+    block = builder.source.block()
+    block.line(0, "def serialize(value):")
+    block.line(1, "return {}(value)".format(fn_name))
+    return builder.source.compile("serialize", "<middle_schema.serializer>")
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions (available to the generated code)
+# --------------------------------------------------------------------------- #
+
+
+def _generic(value):
+    return middle.value_of(get_type(value))(value)
+
+
+def _new_source(decimal):
+    return Source(
+        namespace={
+            "_decimal": decimal,
+            "_dt_to_iso_string": dt_to_iso_string,
+            "_generic": _generic,
+        }
+    )
+
+
+# --------------------------------------------------------------------------- #
+# The code builder
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Builder:
+    source = attr.ib(type=Source)
+    _models = attr.ib(type=dict, factory=dict)
+
+    def function(self, skeleton):
+        if is_model(skeleton.type):
+            if skeleton.type in self._models:
+                return self._models[skeleton.type]
+            fn_name = self.source.function_name(skeleton, "_serialize")
+            self._models[skeleton.type] = fn_name
+        else:
+            fn_name = self.source.function_name(skeleton, "_serialize")
+        block = self.source.block()
+        block.line(0, "def {}(value):".format(fn_name))
+        if is_model(skeleton.type):
+            self._model_body(skeleton, block)
+        else:
+            block.line(
+                1, "return {}".format(self.expression(skeleton, "value"))
+            )
+        return fn_name
+
+    def expression(self, skeleton, value):
+        expression = _expression(skeleton.type, self, skeleton, value)
+        if expression != value and (
+            skeleton.nullable
+            or (skeleton.has_default_value and skeleton.default_value is None)
+        ):
+            return "None if {0} is None else {1}".format(value, expression)
+        return expression
+
+    def _model_body(self, skeleton, block):
+        items = []
+        for child in skeleton.children:
+            value = self.source.name("_f")
+            block.line(1, "{} = value.{}".format(value, child.name))
+            items.append((child.name, self.expression(child, value)))
+        block.line(1, "return {")
+        for name, expression in items:
+            block.line(2, "{!r}: {},".format(name, expression))
+        block.line(1, "}")
+
+
+# --------------------------------------------------------------------------- #
+# Expressions for each type (every value given is a local name)
+# --------------------------------------------------------------------------- #
+
+
+@type_dispatch()
+def _expression(type_, builder, skeleton, value):
+    raise InvalidType()
+
+
+@_expression.register(middle.Model)
+@_expression.register(ModelMeta)
+def _expression_model(type_, builder, skeleton, value):
+    return "{}({})".format(builder.function(skeleton), value)
+
+
+@_expression.register(str)
+@_expression.register(bytes)
+@_expression.register(int)
+@_expression.register(float)
+@_expression.register(bool)
+def _expression_primitive(type_, builder, skeleton, value):
+    return value
+
+
+@_expression.register(Decimal)
+def _expression_decimal(type_, builder, skeleton, value):
+    return "_decimal({})".format(value)
+
+
+@_expression.register(datetime.date)
+def _expression_date(type_, builder, skeleton, value):
+    return "{}.isoformat()".format(value)
+
+
+@_expression.register(datetime.datetime)
+def _expression_datetime(type_, builder, skeleton, value):
+    return "_dt_to_iso_string({})".format(value)
+
+
+@_expression.register(EnumMeta)
+def _expression_enum(type_, builder, skeleton, value):
+    return "{}.value".format(value)
+
+
+@_expression.register(typing.List)
+@_expression.register(typing.Set)
+def _expression_iterable_set(type_, builder, skeleton, value):
+    item = builder.source.name("_item")
+    expression = builder.expression(skeleton.children[0], item)
+    if expression == item:
+        return "list({})".format(value)
+    return "[{} for {} in {}]".format(expression, item, value)
+
+
+@_expression.register(typing.Dict)
+def _expression_dict(type_, builder, skeleton, value):
+    key, item = builder.source.name("_k"), builder.source.name("_item")
+    expression = builder.expression(skeleton.children[0], item)
+    if expression == item:
+        return "dict({})".format(value)
+    return "{{{}: {} for {}, {} in {}.items()}}".format(
+        key, expression, key, item, value
+    )
+
+
+@_expression.register(typing.Union)
+def _expression_union(type_, builder, skeleton, value):
+    if skeleton.type_specific is None or not skeleton.type_specific.get(
+        "any_of", False
+    ):
+        return builder.expression(skeleton.children[0], value)
+    fn_name = builder.source.name("_serialize_union")
+    block = builder.source.block()
+    block.line(0, "def {}(value):".format(fn_name))
+    for child in skeleton.children:
+        check = _instance_check(child.type)
+        if check is None:
+            continue
+        block.line(
+            1, "if isinstance(value, {}):".format(builder.source.const(check))
+        )
+        block.line(2, "return {}".format(builder.expression(child, "value")))
+    block.line(1, "return _generic(value)")
+    return "{}({})".format(fn_name, value)
+
+
+def _instance_check(type_):
+    if is_model(type_) or isinstance(type_, EnumMeta):
+        return type_
+    return {
+        str: str,
+        bytes: bytes,
+        int: int,
+        float: float,
+        bool: bool,
+        Decimal: Decimal,
+        datetime.date: datetime.date,
+        datetime.datetime: datetime.datetime,
+        typing.List: list,
+        typing.Set: set,
+        typing.Dict: dict,
+    }.get(get_type(type_))
@@ -1,6 +1,14 @@
+import base64
 import datetime
+import enum
+import importlib
 import inspect
+import json
+import sys
+import time
 import typing
+import weakref
+from contextvars import ContextVar
 from decimal import Decimal
 from enum import EnumMeta
 
@@ -16,9 +24,13 @@ from middle.exceptions import InvalidType
 from middle.model import ModelMeta
 from middle.validators import BaseValidator
 
+from .metrics import counters
+from .metrics import watch_dispatcher
+from .options import get_option
 from .utils import is_model
 
 _sentinel = object()
+_shallow = ContextVar("middle_schema_shallow", default=False)
 
 
 # --------------------------------------------------------------------------- #
@@ -54,6 +66,10 @@ class Skeleton:
             self.default_value != NOTHING and self.default_value != _sentinel
         )
 
+    def __reduce__(self):
+        # types are pickled by their qualified names and sentinels by tags
+        return from_portable, (to_portable(self),)
+
 
 # --------------------------------------------------------------------------- #
 # Translate models to skeletons
@@ -61,6 +77,22 @@ class Skeleton:
 
 
 def translate(field, model_or_field=None):
+    start = time.perf_counter()
+    try:
+        return _translate(field, model_or_field)
+    finally:
+        counters.translate_calls += 1
+        counters.translate_seconds += time.perf_counter() - start
+
+
+def as_skeleton(model_or_skeleton):
+    if isinstance(model_or_skeleton, Skeleton):
+        return model_or_skeleton
+    return translate(model_or_skeleton)
+
+
+def _translate(field, model_or_field=None):
+    counters.nodes_translated += 1
     if isinstance(field, Attribute):
         return _translate_type(field.type, field)
     else:
@@ -113,6 +145,8 @@ def _get_validator_data(field):
 
 
 def _get_model_description(model):
+    if get_option("openapi_minify"):
+        return None
     if hasattr(model, "__description__") and isinstance(
         model.__description__, str
     ):
@@ -121,7 +155,7 @@ def _get_model_description(model):
 
 
 def _get_attr_description(field):
-    if field is None:
+    if field is None or get_option("openapi_minify"):
         return None
     return field.metadata.get("description", None)
 
@@ -136,6 +170,9 @@ def _translate_type(type_, model_or_field):
     raise InvalidType()
 
 
+watch_dispatcher("translate", _translate_type)
+
+
 # --------------------------------------------------------------------------- #
 # Recursive (Model) types
 # --------------------------------------------------------------------------- #
@@ -144,16 +181,36 @@ def _translate_type(type_, model_or_field):
 @_translate_type.register(middle.Model)
 @_translate_type.register(ModelMeta)
 def _translate_model_meta(type_, model_or_field):
+    children = None
+    if not _shallow.get():
+        children = [_translate(field, type_) for field in attr.fields(type_)]
     return Skeleton(
         name=_get_skel_name(type_, model_or_field),
         description=_get_model_description(type_)
         or _get_attr_description(model_or_field),
         type=type_,
         default_value=_get_default_value(model_or_field),
-        children=[translate(field, type_) for field in attr.fields(type_)],
+        children=children,
     )
 
 
+def translate_shallow(model):
+    # the model fields are translated, but any other model found on them is
+    # left without children (to be translated later, on its own)
+    token = _shallow.set(True)
+    start = time.perf_counter()
+    try:
+        skeleton = _translate(model, None)
+        skeleton.children = [
+            _translate(field, model) for field in attr.fields(model)
+        ]
+    finally:
+        _shallow.reset(token)
+        counters.translate_calls += 1
+        counters.translate_seconds += time.perf_counter() - start
+    return skeleton
+
+
 # --------------------------------------------------------------------------- #
 # All (simple) types available
 # --------------------------------------------------------------------------- #
@@ -184,15 +241,27 @@ def _translate_type_generic(type_, model_or_field):
 # --------------------------------------------------------------------------- #
 
 
+_enums = weakref.WeakKeyDictionary()
+
+
+def _get_enum_data(type_):
+    # enums can't change, so their choices (and the skeleton of the type of
+    # their values) are computed only once, no matter how many fields use it
+    if type_ not in _enums:
+        choices = tuple(e.value for e in type_)
+        _enums[type_] = (choices, _translate(type(choices[0]), None))
+    return _enums[type_]
+
+
 @_translate_type.register(EnumMeta)
 def _translate_type_enum(type_, model_or_field):
-    choices = [e.value for e in type_]
+    choices, child = _get_enum_data(type_)
     return Skeleton(
         name=_get_skel_name(model_or_field),
         description=_get_attr_description(model_or_field),
         default_value=_get_default_value(model_or_field),
         validator_data=_get_validator_data(model_or_field),
-        children=[translate(type(choices[0]), None)],
+        children=[child],
         type=type_,
         type_specific={"choices": choices},
     )
@@ -207,7 +276,7 @@ def _translate_type_iterable_set(type_, model_or_field):
         default_value=_get_default_value(model_or_field),
         type=type_,
         validator_data=_get_validator_data(model_or_field),
-        children=[translate(type_.__args__[0], None)],
+        children=[_translate(type_.__args__[0], None)],
     )
 
 
@@ -220,7 +289,7 @@ def _translate_type_dict(type_, model_or_field):
             default_value=_get_default_value(model_or_field),
             type=type_,
             validator_data=_get_validator_data(model_or_field),
-            children=[translate(type_.__args__[1], None)],
+            children=[_translate(type_.__args__[1], None)],
         )
 
     else:
@@ -241,7 +310,7 @@ def _translate_type_union(type_, model_or_field):
                 default_value=_get_default_value(model_or_field),
                 type=type_,
                 validator_data=_get_validator_data(model_or_field),
-                children=[translate(arg, None)],
+                children=[_translate(arg, None)],
                 nullable=True,
             )
         else:
@@ -252,7 +321,7 @@ def _translate_type_union(type_, model_or_field):
                 type=type_,
                 validator_data=_get_validator_data(model_or_field),
                 children=[
-                    translate(arg, None)
+                    _translate(arg, None)
                     for arg in type_.__args__
                     if arg is not NoneType
                 ],
@@ -267,6 +336,279 @@ def _translate_type_union(type_, model_or_field):
         default_value=_get_default_value(model_or_field),
         type=type_,
         validator_data=_get_validator_data(model_or_field),
-        children=[translate(arg, None) for arg in type_.__args__],
+        children=[_translate(arg, None) for arg in type_.__args__],
         type_specific={"any_of": True},
     )
+
+
+# --------------------------------------------------------------------------- #
+# Portable representation of skeletons (plain data, with types referenced by
+# their qualified names), to be pickled, sent to other processes or cached
+# --------------------------------------------------------------------------- #
+
+_portable_version = 1
+_separators = (",", ":")
+_generics = {
+    typing.List: "List",
+    typing.Set: "Set",
+    typing.Dict: "Dict",
+    typing.Union: "Union",
+    list: "List",
+    set: "Set",
+    dict: "Dict",
+}
+_node_keys = (
+    ("n", "name"),
+    ("x", "description"),
+    ("s", "type_specific"),
+    ("k", "children"),
+)
+
+
+def to_portable(model_or_skeleton):
+    types = _TypeTable()
+    root = _portable_node(as_skeleton(model_or_skeleton), types)
+    return {"v": _portable_version, "t": types.entries, "r": root}
+
+
+def from_portable(data, modules=()):
+    if data.get("v") != _portable_version:
+        raise ValueError(
+            "unsupported portable skeleton version: {!r}".format(data.get("v"))
+        )
+    types, modules = [], frozenset(modules)
+    for entry in data["t"]:
+        types.append(_load_type(entry, types, modules))
+    return _load_node(data["r"], types)
+
+
+def dumps(model_or_skeleton):
+    return json.dumps(
+        to_portable(model_or_skeleton), separators=_separators
+    ).encode("utf-8")
+
+
+def loads(data, modules=()):
+    return from_portable(json.loads(data), modules)
+
+
+@attr.s
+class _TypeTable:
+    entries = attr.ib(type=list, factory=list)
+    _indexes = attr.ib(type=dict, factory=dict)
+
+    def index(self, type_):
+        if type_ not in self._indexes:
+            entry = self._entry(type_)
+            self._indexes[type_] = len(self.entries)
+            self.entries.append(entry)
+        return self._indexes[type_]
+
+    def _entry(self, type_):
+        if type_ is NoneType:
+            return "None"
+        origin = getattr(type_, "__origin__", None)
+        if origin is not None:
+            if origin not in _generics:
+                raise TypeError("unsupported generic type: {!r}".format(type_))
+            # arguments first, so they are always loaded before this entry
+            return [_generics[origin]] + [
+                self.index(arg) for arg in type_.__args__
+            ]
+        name = "{}:{}".format(type_.__module__, type_.__qualname__)
+        if _import_type(name) is not type_:
+            raise ValueError(
+                "{!r} can't be imported as {!r}, so it can't be part of a "
+                "portable skeleton".format(type_, name)
+            )
+        return name
+
+
+def _import_type(name):
+    module_name, _, qualname = name.partition(":")
+    value = importlib.import_module(module_name)
+    try:
+        for part in qualname.split("."):
+            value = getattr(value, part)
+    except AttributeError:
+        return None
+    return value
+
+
+def _load_type(entry, types, modules):
+    # only classes and the generics of _generics are accepted, as loading
+    # portable skeletons must never call anything the data points to
+    if entry == "None":
+        return NoneType
+    elif isinstance(entry, list):
+        if not entry or entry[0] not in _generics.values():
+            raise ValueError("unsupported generic type: {!r}".format(entry))
+        args = tuple(_load_index(i, types) for i in entry[1:])
+        return getattr(typing, entry[0])[args]
+    elif isinstance(entry, str):
+        # importing a module runs its code, so only modules already imported
+        # (or given as trusted) are used
+        module_name, _, _ = entry.partition(":")
+        if module_name not in sys.modules and module_name not in modules:
+            raise ValueError(
+                "{!r} is not imported, so {!r} can't be loaded (import it "
+                "first or give it in modules)".format(module_name, entry)
+            )
+        type_ = _import_type(entry)
+        if inspect.isclass(type_):
+            return type_
+    raise ValueError("{!r} is not a class".format(entry))
+
+
+def _load_index(i, types):
+    if (
+        not isinstance(i, int)
+        or isinstance(i, bool)
+        or not 0 <= i < len(types)
+    ):
+        raise ValueError("invalid type index: {!r}".format(i))
+    return types[i]
+
+
+def _load_enum(value, types):
+    type_ = _load_index(value[0], types)
+    if not (inspect.isclass(type_) and issubclass(type_, enum.Enum)):
+        raise ValueError("{!r} is not an enum".format(type_))
+    return type_(_load_value(value[1], types))
+
+
+def _load_factory(value, types):
+    type_ = _load_index(value, types)
+    if not inspect.isclass(type_):
+        raise ValueError("{!r} is not a class".format(type_))
+    return attr.Factory(type_)
+
+
+def _portable_node(skeleton, types):
+    node = {"t": types.index(skeleton.type)}
+    if skeleton.default_value is NOTHING:
+        node["d"] = {"X": 0}
+    elif skeleton.default_value is not _sentinel:
+        node["d"] = _portable_value(skeleton.default_value, types)
+    if skeleton.validator_data is not None:
+        node["r"] = _portable_value(skeleton.validator_data.rules, types)
+        node["c"] = _portable_value(skeleton.validator_data.type_check, types)
+    if skeleton.nullable:
+        node["u"] = 1
+    for key, name in _node_keys:
+        value = getattr(skeleton, name)
+        if value is None:
+            continue
+        elif name == "children":
+            value = [_portable_node(c, types) for c in value]
+        elif name == "type_specific":
+            value = _portable_value(value, types)
+        node[key] = value
+    return node
+
+
+def _load_node(node, types):
+    kwargs = {name: node.get(key) for key, name in _node_keys}
+    if kwargs["children"] is not None:
+        kwargs["children"] = [_load_node(c, types) for c in kwargs["children"]]
+    if kwargs["type_specific"] is not None:
+        kwargs["type_specific"] = _load_value(kwargs["type_specific"], types)
+    if "r" in node:
+        kwargs["validator_data"] = ValidatorData(
+            rules=_load_value(node["r"], types),
+            type_check=_load_value(node["c"], types),
+        )
+    return Skeleton(
+        type=_load_index(node["t"], types),
+        default_value=_load_value(node["d"], types)
+        if "d" in node
+        else _sentinel,
+        nullable=bool(node.get("u")),
+        **kwargs
+    )
+
+
+# values (defaults, rules and enum choices) are kept as they are when they are
+# already JSON primitives, or as single key objects tagging what they are
+
+
+def _dump_datetime(value):
+    offset = value.utcoffset()
+    return [
+        value.year,
+        value.month,
+        value.day,
+        value.hour,
+        value.minute,
+        value.second,
+        value.microsecond,
+        None if offset is None else offset.total_seconds(),
+    ]
+
+
+def _load_datetime(value, types):
+    *args, offset = value
+    if offset is not None:
+        offset = datetime.timezone(datetime.timedelta(seconds=offset))
+    return datetime.datetime(*args, tzinfo=offset)
+
+
+_tagged_types = (
+    ("D", datetime.datetime, _dump_datetime),
+    ("d", datetime.date, datetime.date.toordinal),
+    ("N", Decimal, str),
+    ("B", bytes, lambda v: base64.b64encode(v).decode("ascii")),
+)
+_tag_loaders = {
+    "D": _load_datetime,
+    "d": lambda v, t: datetime.date.fromordinal(v),
+    "N": lambda v, t: Decimal(v),
+    "B": lambda v, t: base64.b64decode(v),
+    "X": lambda v, t: NOTHING,
+    "T": _load_index,
+    "E": _load_enum,
+    "F": _load_factory,
+    "L": lambda v, t: [_load_value(i, t) for i in v],
+    "U": lambda v, t: tuple(_load_value(i, t) for i in v),
+    "M": lambda v, t: {_load_value(k, t): _load_value(i, t) for k, i in v},
+}
+
+
+def _portable_value(value, types):
+    if isinstance(value, enum.Enum):
+        return {
+            "E": [
+                types.index(type(value)),
+                _portable_value(value.value, types),
+            ]
+        }
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, type) or hasattr(value, "__origin__"):
+        return {"T": types.index(value)}
+    elif isinstance(value, attr.Factory):
+        return {"F": types.index(value.factory)}
+    elif isinstance(value, list):
+        return {"L": [_portable_value(i, types) for i in value]}
+    elif isinstance(value, tuple):
+        return {"U": [_portable_value(i, types) for i in value]}
+    elif isinstance(value, dict):
+        return {
+            "M": [
+                [_portable_value(k, types), _portable_value(v, types)]
+                for k, v in value.items()
+            ]
+        }
+    for tag, type_, dump in _tagged_types:
+        if isinstance(value, type_):
+            return {tag: dump(value)}
+    raise TypeError("{!r} can't be part of a portable skeleton".format(value))
+
+
+def _load_value(value, types):
+    if isinstance(value, dict):
+        ((tag, data),) = value.items()
+        if tag not in _tag_loaders:
+            raise ValueError("unknown value tag: {!r}".format(tag))
+        return _tag_loaders[tag](data, types)
+    return value
@@ -0,0 +1,506 @@
+import datetime
+import re
+import typing
+from decimal import Decimal
+from enum import EnumMeta
+
+import attr
+import middle
+from middle.compat import get_type
+from middle.dispatch import type_dispatch
+from middle.exceptions import InvalidType
+from middle.model import ModelMeta
+
+from .codegen import Source
+from .skel import as_skeleton
+from .utils import is_model
+
+_missing = object()
+
+_date_re = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_datetime_re = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+_num_re = re.compile(r"^[+-]?([0-9]+([\.][0-9]*)?|[.][0-9]+)$")
+
+
+# --------------------------------------------------------------------------- #
+# Compile a validator for raw (decoded JSON) payloads out of a skeleton
+# --------------------------------------------------------------------------- #
+
+
+def compile_validator(model_or_skeleton, fail_fast=True):
+    skeleton = as_skeleton(model_or_skeleton)
+    builder = _Builder(source=_new_source(), fail_fast=fail_fast)
+    fn_name = builder.function(skeleton)
+    block = builder.source.block()
+    block.line(0, "def validate(data):")
+    block.line(1, "errors = []")
+    block.line(1, "{}(data, '', errors)".format(fn_name))
+    block.line(1, "return errors")
+    return builder.source.compile("validate", "<middle_schema.validator>")
+
+
+# --------------------------------------------------------------------------- #
+# Helper functions (available to the generated code)
+# --------------------------------------------------------------------------- #
+
+
+def _join(path, name):
+    if path:
+        return "{}.{}".format(path, name)
+    return name
+
+
+def _item_path(path, index):
+    return "{}[{}]".format(path, index)
+
+
+def _is_unique(value):
+    try:
+        return len(set(value)) == len(value)
+    except TypeError:
+        return all(value.index(v) == i for i, v in enumerate(value))
+
+
+def _is_multiple_of(value, multiple_of):
+    if isinstance(multiple_of, float):
+        return float(Decimal(str(value)) % Decimal(str(multiple_of))) == 0.0
+    return value % multiple_of == 0
+
+
+def _new_source():
+    return Source(
+        namespace={
+            "_missing": _missing,
+            "_join": _join,
+            "_item_path": _item_path,
+            "_is_unique": _is_unique,
+            "_is_multiple_of": _is_multiple_of,
+            "_Decimal": Decimal,
+            "_date": datetime.date,
+            "_datetime": datetime.datetime,
+            "_date_re": _date_re,
+            "_datetime_re": _datetime_re,
+            "_num_re": _num_re,
+        }
+    )
+
+
+# --------------------------------------------------------------------------- #
+# The code builder
+# --------------------------------------------------------------------------- #
+
+
+@attr.s
+class _Builder:
+    source = attr.ib(type=Source)
+    fail_fast = attr.ib(type=bool, default=True)
+    _models = attr.ib(type=dict, factory=dict)
+
+    def function(self, skeleton):
+        if is_model(skeleton.type):
+            if skeleton.type in self._models:
+                return self._models[skeleton.type]
+            fn_name = self.source.function_name(skeleton, "_validate")
+            self._models[skeleton.type] = fn_name
+        else:
+            fn_name = self.source.function_name(skeleton, "_validate")
+        block = self.source.block()
+        block.line(0, "def {}(value, path, errors):".format(fn_name))
+        if is_model(skeleton.type):
+            self._model_body(skeleton, block)
+        else:
+            self.check(skeleton, block, 1, "value", "path")
+        return fn_name
+
+    def error(self, block, level, path, message):
+        block.line(level, "errors.append(({}, {!r}))".format(path, message))
+        if self.fail_fast:
+            block.line(level, "return")
+
+    def check(self, skeleton, block, level, value, path):
+        if skeleton.nullable or (
+            skeleton.has_default_value and skeleton.default_value is None
+        ):
+            block.line(level, "if {} is not None:".format(value))
+            level += 1
+        mark = block.mark()
+        _emit(skeleton.type, self, skeleton, block, level, value, path)
+        block.close(level, mark)
+
+    def type_check(self, block, level, expression, path, message, body=True):
+        block.line(level, "if not ({}):".format(expression))
+        self.error(block, level + 1, path, message)
+        if body:
+            block.line(level, "else:")
+            return level + 1
+        return level
+
+    def has_rules(self, skeleton):
+        return skeleton.validator_data is not None and bool(
+            skeleton.validator_data.rules
+        )
+
+    def rules(self, skeleton, block, level, value, path):
+        if not self.has_rules(skeleton):
+            return
+        rules = skeleton.validator_data.rules
+        mark = block.mark()
+        for key in sorted(rules):
+            handler = _rules.get(key)
+            if handler is None:
+                continue
+            expression, message = handler(self, rules, value)
+            if expression is None:
+                continue
+            block.line(level, "if {}:".format(expression))
+            self.error(block, level + 1, path, message)
+        block.close(level, mark)
+
+    def _model_body(self, skeleton, block):
+        block.line(1, "if not isinstance(value, dict):")
+        block.line(2, "errors.append((path, 'must be an object'))")
+        block.line(2, "return")
+        for child in skeleton.children:
+            value = self.source.name("_f")
+            path = "_join(path, {!r})".format(child.name)
+            block.line(
+                1, "{} = value.get({!r}, _missing)".format(value, child.name)
+            )
+            if not child.nullable and not child.has_default_value:
+                block.line(1, "if {} is _missing:".format(value))
+                self.error(block, 2, path, "is required")
+                block.line(1, "else:")
+            else:
+                block.line(1, "if {} is not _missing:".format(value))
+            self.check(child, block, 2, value, path)
+
+
+# --------------------------------------------------------------------------- #
+# Validation rules
+# --------------------------------------------------------------------------- #
+
+
+def _rule_min_length(builder, rules, value):
+    return (
+        "len({}) < {!r}".format(value, rules["min_length"]),
+        "must have a minimum length of {} chars".format(rules["min_length"]),
+    )
+
+
+def _rule_max_length(builder, rules, value):
+    return (
+        "len({}) > {!r}".format(value, rules["max_length"]),
+        "must have a maximum length of {} chars".format(rules["max_length"]),
+    )
+
+
+def _rule_pattern(builder, rules, value):
+    pattern = rules["pattern"]
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    return (
+        "{}.match({}) is None".format(builder.source.const(pattern), value),
+        "did not match the given pattern: '{}'".format(pattern.pattern),
+    )
+
+
+def _rule_minimum(builder, rules, value):
+    if rules.get("exclusive_minimum", False):
+        return (
+            "{} <= {!r}".format(value, rules["minimum"]),
+            "must have a (exclusive) minimum value of {}".format(
+                rules["minimum"]
+            ),
+        )
+    return (
+        "{} < {!r}".format(value, rules["minimum"]),
+        "must have a minimum value of {}".format(rules["minimum"]),
+    )
+
+
+def _rule_maximum(builder, rules, value):
+    if rules.get("exclusive_maximum", False):
+        return (
+            "{} >= {!r}".format(value, rules["maximum"]),
+            "must have a (exclusive) maximum value of {}".format(
+                rules["maximum"]
+            ),
+        )
+    return (
+        "{} > {!r}".format(value, rules["maximum"]),
+        "must have a maximum value of {}".format(rules["maximum"]),
+    )
+
+
+def _rule_multiple_of(builder, rules, value):
+    return (
+        "not _is_multiple_of({}, {!r})".format(value, rules["multiple_of"]),
+        "must be multiple of {}".format(rules["multiple_of"]),
+    )
+
+
+def _rule_min_items(builder, rules, value):
+    return (
+        "len({}) < {!r}".format(value, rules["min_items"]),
+        "has no enough items of {}".format(rules["min_items"]),
+    )
+
+
+def _rule_max_items(builder, rules, value):
+    return (
+        "len({}) > {!r}".format(value, rules["max_items"]),
+        "has more items than the limit of {}".format(rules["max_items"]),
+    )
+
+
+def _rule_unique_items(builder, rules, value):
+    if not rules["unique_items"]:
+        return None, None
+    return "not _is_unique({})".format(value), "must only have unique items"
+
+
+def _rule_min_properties(builder, rules, value):
+    return (
+        "len({}) < {!r}".format(value, rules["min_properties"]),
+        "has no enough properties of {}".format(rules["min_properties"]),
+    )
+
+
+def _rule_max_properties(builder, rules, value):
+    return (
+        "len({}) > {!r}".format(value, rules["max_properties"]),
+        "has more properties than the limit of {}".format(
+            rules["max_properties"]
+        ),
+    )
+
+
+_rules = {
+    "min_length": _rule_min_length,
+    "max_length": _rule_max_length,
+    "pattern": _rule_pattern,
+    "minimum": _rule_minimum,
+    "maximum": _rule_maximum,
+    "multiple_of": _rule_multiple_of,
+    "min_items": _rule_min_items,
+    "max_items": _rule_max_items,
+    "unique_items": _rule_unique_items,
+    "min_properties": _rule_min_properties,
+    "max_properties": _rule_max_properties,
+}
+
+
+# --------------------------------------------------------------------------- #
+# Code emitters for each type
+# --------------------------------------------------------------------------- #
+
+
+@type_dispatch()
+def _emit(type_, builder, skeleton, block, level, value, path):
+    raise InvalidType()
+
+
+@_emit.register(middle.Model)
+@_emit.register(ModelMeta)
+def _emit_model(type_, builder, skeleton, block, level, value, path):
+    fn_name = builder.function(skeleton)
+    block.line(level, "{}({}, {}, errors)".format(fn_name, value, path))
+    if builder.fail_fast:
+        block.line(level, "if errors:")
+        block.line(level + 1, "return")
+
+
+@_emit.register(str)
+def _emit_str(type_, builder, skeleton, block, level, value, path):
+    level = builder.type_check(
+        block,
+        level,
+        "isinstance({}, str)".format(value),
+        path,
+        "must be a string",
+        body=builder.has_rules(skeleton),
+    )
+    builder.rules(skeleton, block, level, value, path)
+
+
+@_emit.register(bytes)
+def _emit_bytes(type_, builder, skeleton, block, level, value, path):
+    builder.type_check(
+        block,
+        level,
+        "isinstance({}, (str, bytes))".format(value),
+        path,
+        "must be a string",
+        body=False,
+    )
+
+
+@_emit.register(int)
+def _emit_int(type_, builder, skeleton, block, level, value, path):
+    level = builder.type_check(
+        block,
+        level,
+        "isinstance({0}, int) and not isinstance({0}, bool)".format(value),
+        path,
+        "must be an integer",
+        body=builder.has_rules(skeleton),
+    )
+    builder.rules(skeleton, block, level, value, path)
+
+
+@_emit.register(float)
+def _emit_number(type_, builder, skeleton, block, level, value, path):
+    level = builder.type_check(
+        block,
+        level,
+        "isinstance({0}, (int, float, _Decimal)) "
+        "and not isinstance({0}, bool)".format(value),
+        path,
+        "must be a number",
+        body=builder.has_rules(skeleton),
+    )
+    builder.rules(skeleton, block, level, value, path)
+
+
+@_emit.register(Decimal)
+def _emit_decimal(type_, builder, skeleton, block, level, value, path):
+    # decimals are usually transported as strings, to keep their precision
+    level = builder.type_check(
+        block,
+        level,
+        "(isinstance({0}, (int, float, _Decimal)) "
+        "and not isinstance({0}, bool)) or (isinstance({0}, str) "
+        "and _num_re.match({0}) is not None)".format(value),
+        path,
+        "must be a number",
+        body=builder.has_rules(skeleton),
+    )
+    builder.rules(
+        skeleton, block, level, "_Decimal(str({}))".format(value), path
+    )
+
+
+@_emit.register(bool)
+def _emit_bool(type_, builder, skeleton, block, level, value, path):
+    builder.type_check(
+        block,
+        level,
+        "isinstance({}, bool)".format(value),
+        path,
+        "must be a boolean",
+        body=False,
+    )
+
+
+@_emit.register(datetime.date)
+def _emit_date(type_, builder, skeleton, block, level, value, path):
+    builder.type_check(
+        block,
+        level,
+        "isinstance({0}, _date) or (isinstance({0}, str) "
+        "and _date_re.match({0}) is not None)".format(value),
+        path,
+        "must be a date",
+        body=False,
+    )
+
+
+@_emit.register(datetime.datetime)
+def _emit_datetime(type_, builder, skeleton, block, level, value, path):
+    builder.type_check(
+        block,
+        level,
+        "isinstance({0}, _datetime) or (isinstance({0}, str) "
+        "and _datetime_re.match({0}) is not None)".format(value),
+        path,
+        "must be a date-time",
+        body=False,
+    )
+
+
+@_emit.register(EnumMeta)
+def _emit_enum(type_, builder, skeleton, block, level, value, path):
+    choices = skeleton.type_specific.get("choices")
+    choice_types = tuple(sorted({type(c) for c in choices}, key=str))
+    block.line(
+        level,
+        "if (not isinstance({0}, {1}) or {0} not in {2}) "
+        "and not isinstance({0}, {3}):".format(
+            value,
+            builder.source.const(choice_types),
+            builder.source.const(frozenset(choices)),
+            builder.source.const(type_),
+        ),
+    )
+    builder.error(block, level + 1, path, "must be one of the allowed choices")
+
+
+@_emit.register(typing.List)
+@_emit.register(typing.Set)
+def _emit_iterable_set(type_, builder, skeleton, block, level, value, path):
+    if get_type(type_) is typing.Set:
+        instances = "(list, tuple, set, frozenset)"
+    else:
+        instances = "(list, tuple)"
+    level = builder.type_check(
+        block,
+        level,
+        "isinstance({}, {})".format(value, instances),
+        path,
+        "must be an array",
+    )
+    builder.rules(skeleton, block, level, value, path)
+    index, item = builder.source.name("_i"), builder.source.name("_item")
+    block.line(
+        level, "for {}, {} in enumerate({}):".format(index, item, value)
+    )
+    builder.check(
+        skeleton.children[0],
+        block,
+        level + 1,
+        item,
+        "_item_path({}, {})".format(path, index),
+    )
+
+
+@_emit.register(typing.Dict)
+def _emit_dict(type_, builder, skeleton, block, level, value, path):
+    level = builder.type_check(
+        block,
+        level,
+        "isinstance({}, dict)".format(value),
+        path,
+        "must be an object",
+    )
+    builder.rules(skeleton, block, level, value, path)
+    key, item = builder.source.name("_k"), builder.source.name("_item")
+    block.line(level, "for {}, {} in {}.items():".format(key, item, value))
+    block.line(level + 1, "if not isinstance({}, str):".format(key))
+    builder.error(block, level + 2, path, "must only have string keys")
+    builder.check(
+        skeleton.children[0],
+        block,
+        level + 1,
+        item,
+        "_join({}, {})".format(path, key),
+    )
+
+
+@_emit.register(typing.Union)
+def _emit_union(type_, builder, skeleton, block, level, value, path):
+    if skeleton.type_specific is None or not skeleton.type_specific.get(
+        "any_of", False
+    ):
+        builder.check(skeleton.children[0], block, level, value, path)
+        return
+    branches = [builder.function(c) for c in skeleton.children]
+    fn, errors = builder.source.name("_fn"), builder.source.name("_errors")
+    block.line(level, "for {} in ({},):".format(fn, ", ".join(branches)))
+    block.line(level + 1, "{} = []".format(errors))
+    block.line(level + 1, "{}({}, {}, {})".format(fn, value, path, errors))
+    block.line(level + 1, "if not {}:".format(errors))
+    block.line(level + 2, "break")
+    block.line(level, "else:")
+    builder.error(
+        block, level + 1, path, "does not match any of the allowed types"
+    )
@@ -0,0 +1,77 @@
+import json
+import typing as t
+
+import middle
+
+from middle_schema.analysis import analyze
+from middle_schema.openapi import parse
+
+
+class Player(middle.Model):
+    """A player"""
+
+    nickname = middle.field(type=str, description="The nickname")
+
+
+class Game(middle.Model):
+    name = middle.field(type=str)
+    players = middle.field(type=t.List[Player])
+    rating = middle.field(type=t.Dict[str, float])
+    favorite = middle.field(type=Player)
+
+
+def test_analyze_components():
+    with middle.config.temp(openapi_model_as_component=True):
+        api = parse(Game)
+    analysis = analyze(api)
+
+    assert [s.name for s in analysis.schemas] == [
+        "Game",
+        "Player",
+        "(specification)",
+    ]
+    assert analysis.size == len(
+        json.dumps(
+            {**api.components, "(specification)": api.specification},
+            separators=(",", ":"),
+        )
+    )
+    game, player, specification = analysis.schemas
+    assert game.size == len(
+        json.dumps(api.components["Game"]).replace(" ", "")
+    )
+    assert game.depth == 3
+    assert game.fan_out == 1
+    assert game.inbound_refs == 1
+    assert game.description_size == 0
+    assert game.largest_subtrees[0] == (
+        "/properties/rating",
+        len(
+            json.dumps(
+                api.components["Game"]["properties"]["rating"],
+                separators=(",", ":"),
+            )
+        ),
+    )
+    assert player.inbound_refs == 2
+    assert player.depth == 2
+    assert player.description_size == len(
+        '"description":"A player",' + '"description":"The nickname",'
+    )
+    assert 0 < player.description_share < 1
+    assert specification.fan_out == 1
+
+
+def test_analyze_inline():
+    with middle.config.temp(openapi_model_as_component=False):
+        analysis = analyze(parse(Game))
+
+    (specification,) = analysis.schemas
+    assert specification.depth == 4
+    assert specification.fan_out == 0
+    assert [p for p, _ in specification.largest_subtrees] == [
+        "/properties/players",
+        "/properties/favorite",
+        "/properties/rating",
+    ]
+    assert "/properties/players" in analysis.format_report()
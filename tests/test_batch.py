@@ -0,0 +1,205 @@
+import enum
+import typing as t
+
+import middle
+import pytest
+
+from middle_schema.validator import compile_validator
+
+np = pytest.importorskip("numpy")
+
+from middle_schema.batch import compile_batch_validator  # noqa
+
+
+@enum.unique
+class StatusEnum(str, enum.Enum):
+    ACTIVE = "ACTIVE"
+    INACTIVE = "INACTIVE"
+
+
+class Product(middle.Model):
+    name = middle.field(type=str, min_length=2, max_length=10)
+    price = middle.field(type=float, minimum=0, exclusive_minimum=True)
+    quantity = middle.field(type=int, maximum=100, multiple_of=5)
+    discount = middle.field(type=float, multiple_of=0.25, default=None)
+    available = middle.field(type=bool, default=True)
+    status = middle.field(type=StatusEnum)
+    code = middle.field(type=str, pattern=r"^[A-Z]{3}$")
+    tags = middle.field(type=t.List[str], default=[])
+
+
+_records = [
+    {
+        "name": "Valid",
+        "price": 1.5,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "V",
+        "price": 1.5,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 0,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 7,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 105,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": True,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "NOPE",
+        "code": "ABC",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "abc",
+    },
+    {"price": 1, "quantity": 5, "status": "ACTIVE", "code": "ABC"},
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+        "discount": 0.5,
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+        "discount": 0.3,
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+        "discount": None,
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+        "available": "no",
+    },
+    {
+        "name": "Valid",
+        "price": 1,
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+        "tags": "no",
+    },
+    {
+        "name": "Valid",
+        "price": "1",
+        "quantity": 5,
+        "status": "ACTIVE",
+        "code": "ABC",
+    },
+    ["not", "even", "a", "dict"],
+]
+
+
+def test_batch_validator():
+    validate = compile_batch_validator(Product)
+    mask = validate(_records)
+
+    assert isinstance(mask, np.ndarray)
+    assert mask.tolist() == [
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+
+def test_batch_validator_agrees_with_scalar_validator():
+    validate = compile_batch_validator(Product)
+    scalar = compile_validator(Product)
+
+    assert validate(_records).tolist() == [bool(scalar(r)) for r in _records]
+
+
+def test_batch_validator_big_integers():
+    class TestModel(middle.Model):
+        value = middle.field(type=int, minimum=0)
+
+    validate = compile_batch_validator(TestModel)
+
+    assert validate([{"value": 2**70}, {"value": -(2**70)}]).tolist() == [
+        False,
+        True,
+    ]
+
+
+def test_batch_validator_multiple_of():
+    class TestModel(middle.Model):
+        by_int = middle.field(type=float, multiple_of=3)
+        by_float = middle.field(type=float, multiple_of=0.1)
+
+    records = [
+        {"by_int": 300001.0, "by_float": 0.3},
+        {"by_int": 300000.0, "by_float": 100000.3},
+        {"by_int": 3, "by_float": 100000.35},
+        {"by_int": 3e17, "by_float": 0.7},
+        {"by_int": -6.0, "by_float": 1e-12},
+    ]
+    validate = compile_batch_validator(TestModel)
+    scalar = compile_validator(TestModel, fail_fast=False)
+
+    assert validate(records).tolist() == [bool(scalar(r)) for r in records]
+    assert validate(records).tolist() == [True, False, True, False, True]
+
+
+def test_batch_validator_only_for_models():
+    with pytest.raises(TypeError):
+        compile_batch_validator(t.List[int])
@@ -0,0 +1,138 @@
+import json
+import os
+
+import pytest
+
+from middle_schema.cli import Builder
+from middle_schema.cli import Watcher
+from middle_schema.cli import find_models
+from middle_schema.cli import main
+
+_common = """
+import enum
+
+import middle
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Address(middle.Model):
+    street = middle.field(type=str)
+"""
+
+_models = """
+import typing as t
+
+import middle
+
+from {0}.common import Address
+from {0}.common import Color
+
+
+class Customer(middle.Model):
+    name = middle.field(type=str)
+    addresses = middle.field(type=t.List[Address])
+
+
+class Order(middle.Model):
+    total = middle.field(type=float)
+    color = middle.field(type=Color)
+"""
+
+
+@pytest.fixture
+def package(tmpdir, monkeypatch):
+    # every test gets its own package, as modules are cached on import
+    name = "cli_{}".format(os.path.basename(str(tmpdir)).replace("-", "_"))
+    root = tmpdir.mkdir("src").mkdir(name)
+    root.join("__init__.py").write("")
+    root.join("common.py").write(_common)
+    root.join("models.py").write(_models.format(name))
+    monkeypatch.syspath_prepend(str(tmpdir.join("src")))
+    return name, root
+
+
+def _output(tmpdir, *names):
+    return sorted(str(tmpdir.join("out", name)) for name in names)
+
+
+def test_find_models(package):
+    name, _ = package
+
+    assert [m.__name__ for m in find_models([name])] == [
+        "Address",
+        "Customer",
+        "Order",
+    ]
+    assert [
+        m.__name__ for m in find_models(["{}.models:Order".format(name), name])
+    ] == ["Order", "Address", "Customer"]
+
+    with pytest.raises(TypeError):
+        find_models(["{}.common:Color".format(name)])
+
+
+def test_main(package, tmpdir, capsys):
+    name, root = package
+    output = str(tmpdir.join("out"))
+
+    assert main([name, "-o", output, "-j", "2"]) == 0
+    out = capsys.readouterr().out
+    assert "3 built, 0 unchanged" in out
+    assert "built {}.models:Customer".format(name) in out
+    with open(os.path.join(output, "{}.models.Order.json".format(name))) as f:
+        api = json.load(f)
+    assert api["specification"] == {"$ref": "#/components/schemas/Order"}
+    assert set(api["components"]) == {"Order", "Color"}
+
+    assert main([name, "-o", output, "-j", "1"]) == 0
+    assert "0 built, 3 unchanged" in capsys.readouterr().out
+
+    # Address doesn't depend on the changed module
+    root.join("models.py").write(_models.format(name) + "\n\n# changed\n")
+    assert main([name, "-o", output, "-j", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "2 built, 1 unchanged" in out
+    assert "built {}.common:Address".format(name) not in out
+
+    # other options, other fingerprints
+    assert main([name, "-o", output, "-j", "1", "--inline"]) == 0
+    assert "3 built, 0 unchanged" in capsys.readouterr().out
+    with open(os.path.join(output, "{}.models.Order.json".format(name))) as f:
+        assert json.load(f)["components"] == {}
+
+    assert main([name, "-o", output, "-j", "1", "--inline", "-f"]) == 0
+    assert "3 built, 0 unchanged" in capsys.readouterr().out
+
+
+def test_watcher(package, tmpdir, capsys):
+    name, root = package
+    output = str(tmpdir.join("out"))
+    builder = Builder(
+        output=output,
+        options={},
+        state_path=str(tmpdir.join("state.json")),
+    )
+    watcher = Watcher(targets=[name], builder=builder)
+    assert builder.build(watcher._models) == (3, 0)
+    assert watcher.poll() is None
+
+    root.join("common.py").write(
+        _common + "    number = middle.field(type=int)\n"
+    )
+    assert watcher.poll() == (3, 0)
+
+    path = os.path.join(output, "{}.models.Customer.json".format(name))
+    with open(path) as f:
+        address = json.load(f)["components"]["Address"]
+    assert set(address["properties"]) == {"street", "number"}
+
+    root.join("models.py").write(_models.format(name) + "\n\n# changed\n")
+    assert watcher.poll() == (2, 1)
+
+    root.join("models.py").write("this is not python")
+    assert watcher.poll() is None
+    assert "error reloading models" in capsys.readouterr().out
@@ -0,0 +1,166 @@
+import datetime
+import enum
+import typing as t
+from decimal import Decimal
+
+import middle
+import pytest
+
+from middle_schema.skel import translate
+
+np = pytest.importorskip("numpy")
+
+from middle_schema.columnar import from_columns  # noqa
+from middle_schema.columnar import from_structured  # noqa
+from middle_schema.columnar import structured_dtype  # noqa
+from middle_schema.columnar import to_columns  # noqa
+from middle_schema.columnar import to_structured  # noqa
+
+
+@enum.unique
+class SideEnum(str, enum.Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+
+
+class Trade(middle.Model):
+    symbol = middle.field(type=str, max_length=8)
+    side = middle.field(type=SideEnum)
+    quantity = middle.field(type=int)
+    price = middle.field(type=float)
+    fee = middle.field(type=Decimal)
+    settled = middle.field(type=bool)
+    trade_date = middle.field(type=datetime.date)
+    executed_at = middle.field(type=datetime.datetime)
+
+
+def _trades():
+    return [
+        Trade(
+            symbol="ABC",
+            side=SideEnum.BUY,
+            quantity=10,
+            price=1.5,
+            fee=Decimal("0.25"),
+            settled=True,
+            trade_date=datetime.date(2018, 8, 1),
+            executed_at=datetime.datetime(
+                2018, 8, 1, 10, tzinfo=datetime.timezone.utc
+            ),
+        ),
+        Trade(
+            symbol="XYZW",
+            side=SideEnum.SELL,
+            quantity=5,
+            price=2.0,
+            fee=Decimal("0.5"),
+            settled=False,
+            trade_date=datetime.date(2018, 8, 2),
+            executed_at=datetime.datetime(
+                2018, 8, 2, 11, 30, tzinfo=datetime.timezone.utc
+            ),
+        ),
+    ]
+
+
+def test_structured_dtype():
+    dtype = structured_dtype(Trade)
+
+    assert dtype == np.dtype(
+        [
+            ("symbol", "U8"),
+            ("side", "i1"),
+            ("quantity", "i8"),
+            ("price", "f8"),
+            ("fee", "f8"),
+            ("settled", "?"),
+            ("trade_date", "datetime64[D]"),
+            ("executed_at", "datetime64[us]"),
+        ]
+    )
+    assert structured_dtype(translate(Trade)) == dtype
+
+
+def test_structured_round_trip():
+    trades = _trades()
+    array = to_structured(Trade, trades)
+
+    assert array.dtype == structured_dtype(Trade)
+    assert array["side"].tolist() == [0, 1]
+    assert array["quantity"].sum() == 15
+
+    loaded = from_structured(Trade, array)
+
+    assert all(isinstance(i, Trade) for i in loaded)
+    assert [middle.asdict(i) for i in loaded] == [
+        middle.asdict(i) for i in trades
+    ]
+    assert from_structured(Trade, array, as_dicts=True)[1] == {
+        "symbol": "XYZW",
+        "side": SideEnum.SELL,
+        "quantity": 5,
+        "price": 2.0,
+        "fee": Decimal("0.5"),
+        "settled": False,
+        "trade_date": datetime.date(2018, 8, 2),
+        "executed_at": datetime.datetime(
+            2018, 8, 2, 11, 30, tzinfo=datetime.timezone.utc
+        ),
+    }
+
+
+def test_columns_from_dicts():
+    payloads = [
+        {
+            "symbol": "ABC",
+            "side": "BUY",
+            "quantity": 10,
+            "price": 1.5,
+            "fee": "0.25",
+            "settled": True,
+            "trade_date": "2018-08-01",
+            "executed_at": "2018-08-01T10:00:00+00:00",
+        }
+    ]
+    columns = to_columns(Trade, payloads)
+
+    assert sorted(columns) == sorted(structured_dtype(Trade).names)
+    assert columns["executed_at"][0] == np.datetime64("2018-08-01T10:00:00")
+    assert columns["fee"][0] == 0.25
+
+    loaded = from_columns(Trade, columns)[0]
+
+    assert loaded.side is SideEnum.BUY
+    assert loaded.trade_date == datetime.date(2018, 8, 1)
+
+
+def test_columns_from_dicts_defaults():
+    class Person(middle.Model):
+        name = middle.field(type=str, max_length=8)
+        age = middle.field(type=int, default=0)
+        score = middle.field(
+            type=float, default=middle.model.attr.Factory(float)
+        )
+
+    columns = to_columns(Person, [{"name": "a"}, {"name": "b", "age": 3}])
+
+    assert columns["age"].tolist() == [0, 3]
+    assert columns["score"].tolist() == [0.0, 0.0]
+
+    with pytest.raises(KeyError):
+        to_columns(Person, [{"age": 3}])
+
+
+def test_only_flat_models():
+    class NoMaxLength(middle.Model):
+        name = middle.field(type=str)
+
+    class NotFlat(middle.Model):
+        names = middle.field(type=t.List[int])
+
+    with pytest.raises(TypeError):
+        structured_dtype(NoMaxLength)
+    with pytest.raises(TypeError):
+        structured_dtype(NotFlat)
+    with pytest.raises(TypeError):
+        structured_dtype(t.List[int])
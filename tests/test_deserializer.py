@@ -0,0 +1,147 @@
+import datetime
+import enum
+import typing as t
+from decimal import Decimal
+
+import middle
+import pytest
+from middle.exceptions import ValidationError
+
+from middle_schema.deserializer import compile_deserializer
+from middle_schema.serializer import compile_serializer
+
+
+@enum.unique
+class LanguageEnum(enum.IntEnum):
+    ENGLISH = 1
+    JAPANESE = 2
+
+
+class Author(middle.Model):
+    name = middle.field(type=str, min_length=2)
+    born = middle.field(type=datetime.date, default=None)
+
+
+class Chapter(middle.Model):
+    title = middle.field(type=str)
+    pages = middle.field(type=int, minimum=1)
+
+
+class Book(middle.Model):
+    title = middle.field(type=str)
+    price = middle.field(type=Decimal)
+    score = middle.field(type=float)
+    language = middle.field(type=LanguageEnum)
+    published_at = middle.field(type=datetime.datetime)
+    author = middle.field(type=Author)
+    chapters = middle.field(type=t.List[Chapter])
+    tags = middle.field(type=t.Set[str], default=set())
+    translations = middle.field(type=t.Dict[str, LanguageEnum], default={})
+    in_stock = middle.field(type=bool, default=True)
+
+
+_payload = {
+    "title": "Some book",
+    "price": "10.5",
+    "score": 9,
+    "language": 1,
+    "published_at": "2018-08-01T10:00:00+00:00",
+    "author": {"name": "Someone", "born": "1980-10-10"},
+    "chapters": [{"title": "One", "pages": 10}, {"title": "Two", "pages": 5}],
+    "translations": {"pt": 2},
+}
+
+
+def test_deserializer():
+    deserialize = compile_deserializer(Book)
+    book = deserialize(_payload)
+
+    assert isinstance(book, Book)
+    assert book.title == "Some book"
+    assert book.price == Decimal("10.5")
+    assert isinstance(book.score, float)
+    assert book.language is LanguageEnum.ENGLISH
+    assert book.published_at == datetime.datetime(
+        2018, 8, 1, 10, tzinfo=datetime.timezone.utc
+    )
+    assert isinstance(book.author, Author)
+    assert book.author.born == datetime.date(1980, 10, 10)
+    assert [c.pages for c in book.chapters] == [10, 5]
+    assert isinstance(book.chapters[0], Chapter)
+    assert book.tags == set()
+    assert book.translations == {"pt": LanguageEnum.JAPANESE}
+    assert book.in_stock is True
+
+
+def test_deserializer_agrees_with_middle():
+    deserialize = compile_deserializer(Chapter)
+    serialize = compile_serializer(Chapter)
+    payload = {"title": "One", "pages": 10}
+
+    assert serialize(deserialize(payload)) == middle.asdict(Chapter(**payload))
+
+
+def test_deserializer_validation():
+    deserialize = compile_deserializer(Book)
+
+    with pytest.raises(ValidationError) as err:
+        deserialize({**_payload, "author": {"name": "S"}})
+    assert str(err.value) == (
+        "'author.name' must have a minimum length of 2 chars"
+    )
+
+    with pytest.raises(ValidationError) as err:
+        deserialize([])
+    assert str(err.value) == "must be an object"
+
+
+def test_deserializer_without_validation():
+    deserialize = compile_deserializer(Chapter, validate=False)
+    chapter = deserialize({"title": "One", "pages": 0})
+
+    # that's what ``validate=False`` is about: trusting the payload
+    assert chapter.pages == 0
+
+
+def test_deserializer_mutable_defaults():
+    deserialize = compile_deserializer(Book)
+    payload = {k: v for k, v in _payload.items() if k != "translations"}
+    first, second = deserialize(payload), deserialize(payload)
+    first.tags.add("x")
+    first.translations["pt"] = LanguageEnum.JAPANESE
+
+    # as with middle, every instance gets its own copy of the default
+    assert second.tags == set() and second.translations == {}
+    assert deserialize(payload).tags == set()
+
+
+def test_deserializer_union():
+    class TestModel(middle.Model):
+        value = middle.field(type=t.Union[Chapter, Author])
+
+    deserialize = compile_deserializer(TestModel)
+
+    assert isinstance(
+        deserialize({"value": {"name": "Someone"}}).value, Author
+    )
+    assert isinstance(
+        deserialize({"value": {"title": "One", "pages": 1}}).value, Chapter
+    )
+
+
+def test_deserializer_post_init_and_factory():
+    class TestModel(middle.Model):
+        name = middle.field(type=str)
+        tags = middle.field(
+            type=t.List[str], default=middle.model.attr.Factory(list)
+        )
+        upper_name = middle.field(type=str, default="")
+
+        def __attrs_post_init__(self):
+            self.upper_name = self.name.upper()
+
+    deserialize = compile_deserializer(TestModel)
+    first, second = deserialize({"name": "a"}), deserialize({"name": "b"})
+
+    assert first.upper_name == "A"
+    assert first.tags == [] and first.tags is not second.tags
@@ -0,0 +1,161 @@
+import gzip
+import json
+import os
+import typing as t
+import zlib
+
+import middle
+import pytest
+
+from middle_schema.export import ComponentStore
+from middle_schema.export import compress
+from middle_schema.export import dumps
+from middle_schema.export import etag
+from middle_schema.export import export
+from middle_schema.export import export_split
+from middle_schema.export import export_store
+from middle_schema.openapi import OpenAPI
+from middle_schema.openapi import parse
+
+
+class Person(middle.Model):
+    name = middle.field(type=str, description="The name, ação")
+
+
+def test_dumps():
+    api = parse(Person)
+    data = dumps(api)
+
+    assert json.loads(data.decode("utf-8")) == {
+        "components": api.components,
+        "specification": api.specification,
+    }
+    assert "ação".encode("utf-8") in data
+    assert dumps({"a": 1}) == b'{"a":1}'
+
+
+def test_compress():
+    data = dumps(parse(Person))
+
+    assert compress(data, "identity") is data
+    assert gzip.decompress(compress(data, "gzip")) == data
+    assert zlib.decompress(compress(data, "deflate")) == data
+    assert compress(data, "gzip") == compress(data, "gzip")
+
+    with pytest.raises(ValueError):
+        compress(data, "br")
+
+
+def test_export(tmpdir):
+    path = str(tmpdir.join("openapi.json"))
+    artifacts = export(parse(Person), path)
+
+    assert [a.encoding for a in artifacts] == ["identity", "gzip", "deflate"]
+    assert [a.path for a in artifacts] == [
+        path,
+        path + ".gz",
+        path + ".zz",
+    ]
+    for artifact in artifacts:
+        with open(artifact.path, "rb") as f:
+            data = f.read()
+        assert artifact.length == len(data)
+        assert artifact.etag == etag(data)
+    assert len({a.etag for a in artifacts}) == 3
+
+    with open(path + ".manifest.json") as f:
+        manifest = json.load(f)
+    assert manifest["gzip"] == {
+        "path": "openapi.json.gz",
+        "length": artifacts[1].length,
+        "etag": artifacts[1].etag,
+    }
+    assert sorted(tmpdir.listdir()) == sorted(
+        tmpdir.join(name)
+        for name in (
+            "openapi.json",
+            "openapi.json.gz",
+            "openapi.json.zz",
+            "openapi.json.manifest.json",
+        )
+    )
+
+
+def test_export_split(tmpdir):
+    class Game(middle.Model):
+        players = middle.field(type=t.List[Person])
+        owner = middle.field(type=Person)
+
+    api = parse(Game)
+    paths = export_split(api, str(tmpdir.join("spec")), workers=2)
+
+    def load(name):
+        with open(str(tmpdir.join("spec", name))) as f:
+            return json.load(f)
+
+    assert sorted(os.path.basename(p) for p in paths) == [
+        "Game.json",
+        "Person.json",
+        "index.json",
+    ]
+    assert load("index.json") == {
+        "components": {"Game": "Game.json", "Person": "Person.json"},
+        "specification": {"$ref": "Game.json"},
+    }
+    assert load("Person.json") == api.components["Person"]
+    game = load("Game.json")
+    assert game["properties"]["owner"] == {"$ref": "Person.json"}
+    assert game["properties"]["players"]["items"] == {"$ref": "Person.json"}
+
+
+def test_export_split_grouped(tmpdir):
+    class Game(middle.Model):
+        owner = middle.field(type=Person)
+
+    groups = {"Game": "games", "Person": "people"}
+    export_split(parse(Game), str(tmpdir), group_by=groups.get)
+
+    with open(str(tmpdir.join("games.json"))) as f:
+        games = json.load(f)
+    assert games["Game"]["properties"]["owner"] == {
+        "$ref": "people.json#/Person"
+    }
+    with open(str(tmpdir.join("index.json"))) as f:
+        assert json.load(f)["specification"] == {"$ref": "games.json#/Game"}
+
+    with pytest.raises(ValueError):
+        export_split(parse(Game), str(tmpdir), group_by=lambda name: "index")
+
+
+def test_export_store(tmpdir):
+    components = {
+        "Zebra": {"type": "object", "description": "ação"},
+        "Ação": {"type": "string"},
+    }
+    for i in range(100):
+        components["Model{}".format(i)] = {"type": "integer", "maximum": i}
+    api = OpenAPI(components=components, specification={})
+    path = export_store(api, str(tmpdir.join("components.bin")))
+
+    with ComponentStore(path) as store:
+        assert len(store) == 102
+        assert sorted(store) == sorted(components)
+        for name, schema in components.items():
+            assert name in store
+            assert store[name] == schema
+            assert store.raw(name) == dumps(schema)
+        assert "Model100" not in store
+        assert store.get("Model100") is None
+        with pytest.raises(KeyError):
+            store["Model100"]
+
+    with open(path, "rb") as f:
+        data = f.read()
+    export_store(api, path)
+    with open(path, "rb") as f:
+        assert f.read() == data  # reproducible
+
+    other = tmpdir.join("other.bin")
+    other.write_binary(b"not a store at all")
+    with pytest.raises(ValueError):
+        ComponentStore(str(other))
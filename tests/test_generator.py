@@ -0,0 +1,92 @@
+import datetime
+import enum
+import itertools
+import types
+import typing as t
+from decimal import Decimal
+
+import middle
+
+from middle_schema.deserializer import compile_deserializer
+from middle_schema.generator import generate
+from middle_schema.validator import compile_validator
+
+
+@enum.unique
+class PlatformEnum(str, enum.Enum):
+    XBOX1 = "XBOX1"
+    PLAYSTATION4 = "PLAYSTATION4"
+    PC = "PC"
+
+
+class Player(middle.Model):
+    nickname = middle.field(type=str, min_length=3, max_length=12)
+    youtube_channel = middle.field(type=str, default=None)
+
+
+class Game(middle.Model):
+    name = middle.field(type=str, max_length=10)
+    platform = middle.field(type=PlatformEnum)
+    score = middle.field(type=float, minimum=0, maximum=10, multiple_of=0.1)
+    price = middle.field(type=Decimal, minimum=0, exclusive_minimum=True)
+    copies = middle.field(type=int, maximum=-5, multiple_of=5)
+    resolution_tested = middle.field(type=str, pattern=r"^\d{3,4}x\d+$")
+    code = middle.field(type=str, pattern=r"^(ab|[^a-z]{2})\w?.[A-F]*$")
+    genre = middle.field(type=t.List[str], min_items=1, unique_items=True)
+    rating = middle.field(type=t.Dict[str, int], min_properties=1)
+    players = middle.field(type=t.Set[Player], default=set())
+    released = middle.field(type=bool, default=True)
+    released_at = middle.field(type=datetime.date)
+    updated_at = middle.field(type=datetime.datetime, default=None)
+    remarkable = middle.field(type=t.Union[Player, int])
+
+
+def test_generate_valid_payloads():
+    validate = compile_validator(Game, fail_fast=False)
+    deserialize = compile_deserializer(Game)
+
+    for payload in generate(Game, count=500, seed=42):
+        assert validate(payload) == []
+        assert isinstance(deserialize(payload), Game)
+
+
+def test_generate_is_seedable():
+    assert list(generate(Game, count=10, seed=1)) == list(
+        generate(Game, count=10, seed=1)
+    )
+    assert list(generate(Game, count=10, seed=1)) != list(
+        generate(Game, count=10, seed=2)
+    )
+
+
+def test_generate_is_a_stream():
+    payloads = generate(Player, seed=42)
+
+    assert isinstance(payloads, types.GeneratorType)
+    assert len(list(itertools.islice(payloads, 1000))) == 1000
+
+
+def test_generate_invalid_payloads():
+    validate = compile_validator(Game)
+
+    for payload in generate(Game, count=500, seed=42, invalid_ratio=1.0):
+        assert validate(payload) != []
+
+    invalid = sum(
+        1
+        for payload in generate(Game, count=1000, seed=42, invalid_ratio=0.2)
+        if validate(payload)
+    )
+    assert 100 < invalid < 300
+
+
+def test_generate_rules():
+    class TestModel(middle.Model):
+        even = middle.field(type=int, minimum=1, maximum=9, multiple_of=2)
+        ratio = middle.field(
+            type=float, minimum=0, maximum=1, exclusive_maximum=True
+        )
+
+    for payload in generate(TestModel, count=200, seed=42):
+        assert payload["even"] in (2, 4, 6, 8)
+        assert 0 <= payload["ratio"] < 1
@@ -0,0 +1,202 @@
+import datetime
+import enum
+import json
+import typing as t
+
+import middle
+import pytest
+from middle.exceptions import ValidationError
+
+from middle_schema.export import dumps
+from middle_schema.loader import load_models
+from middle_schema.openapi import parse
+from middle_schema.skel import Skeleton
+
+
+@enum.unique
+class Size(str, enum.Enum):
+    SMALL = "small"
+    LARGE = "large"
+
+
+class Address(middle.Model):
+    """An address"""
+
+    street = middle.field(type=str, min_length=3, description="The street")
+    number = middle.field(type=int, minimum=1)
+
+
+class Person(middle.Model):
+    name = middle.field(type=str, max_length=20)
+    size = middle.field(type=Size, description="The size")
+    addresses = middle.field(type=t.List[Address], min_items=1)
+    scores = middle.field(type=t.Dict[str, float])
+    birthday = middle.field(type=datetime.date)
+    active = middle.field(type=bool)
+
+
+def test_load_models_round_trip():
+    api = parse(Person)
+    models = load_models(json.loads(dumps(api).decode("utf-8")))
+
+    assert sorted(models) == ["Address", "Person", "Size"]
+    assert models.loaded == []
+
+    person = models.Person
+    assert sorted(models.loaded) == ["Address", "Person", "Size"]
+    assert models.Person is person  # cached
+    assert models["Person"] is person
+    assert parse(person).components == api.components
+
+    instance = person(
+        name="Jane",
+        size="large",
+        addresses=[{"street": "Main St", "number": 10}],
+        scores={"math": 9.5},
+        birthday="2000-01-01",
+        active=True,
+    )
+    assert instance.size == models.Size.LARGE
+    assert instance.addresses[0].number == 10
+
+    with pytest.raises(ValidationError):
+        person(
+            name="Jane",
+            size="large",
+            addresses=[{"street": "St", "number": 10}],
+            scores={},
+            birthday="2000-01-01",
+            active=True,
+        )
+
+    skeleton = models.skeleton("Address")
+    assert isinstance(skeleton, Skeleton)
+    assert skeleton.description == "An address"
+
+
+def test_load_models_lazily():
+    models = load_models(
+        {
+            "openapi": "3.0.0",
+            "components": {
+                "schemas": {
+                    "Pet": {
+                        "type": "object",
+                        "properties": {
+                            "kind": {"type": "string", "enum": ["cat", "dog"]},
+                            "owner": {"$ref": "#/components/schemas/Owner"},
+                        },
+                        "required": ["kind", "owner"],
+                    },
+                    "Owner": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}},
+                        "required": ["name"],
+                    },
+                    "Broken": {
+                        "type": "object",
+                        "additionalProperties": True,
+                    },
+                }
+            },
+        }
+    )
+
+    assert len(models) == 3
+    assert "Pet" in models
+    assert "Broken" in dir(models)
+
+    owner = models.Owner
+    assert models.loaded == ["Owner"]
+    pet = models.Pet(kind="cat", owner={"name": "Jane"})
+    assert isinstance(pet.owner, owner)
+    assert [e.value for e in type(pet.kind)] == ["cat", "dog"]
+
+    with pytest.raises(TypeError):
+        models.Broken
+    with pytest.raises(AttributeError):
+        models.Missing
+    with pytest.raises(KeyError):
+        models["Missing"]
+
+
+def test_load_models_json_schema():
+    models = load_models(
+        {
+            "$defs": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "next": {"$ref": "#/$defs/Node"},
+                        "value": {"type": "integer"},
+                    },
+                    "required": ["next", "value"],
+                }
+            }
+        }
+    )
+
+    with pytest.raises(TypeError) as e:
+        models.Node
+    assert "Node -> Node" in str(e.value)
+
+    with pytest.raises(ValueError):
+        load_models({"type": "object"})
+
+
+def test_load_models_enum_names():
+    choices = ["asc", "ASC", 1, "value_3", "VALUE_2", "value_0", None]
+    models = load_models(
+        {"definitions": {"Order": {"type": "string", "enum": choices}}}
+    )
+    order = models.Order
+
+    assert [e.value for e in order] == choices
+    assert [e.name for e in order] == [
+        "ASC",
+        "VALUE_1",
+        "VALUE_2",
+        "VALUE_3",
+        "VALUE_4",
+        "VALUE_0",
+        "VALUE_6",
+    ]
+
+    models = load_models(
+        {"definitions": {"Pair": {"type": "string", "enum": ["value_1", 2]}}}
+    )
+    assert [e.name for e in models.Pair] == ["VALUE_1", "VALUE_1_"]
+
+
+@pytest.mark.parametrize("name", ["pet-name", "class", "self", "1st"])
+def test_load_models_property_names(name):
+    models = load_models(
+        {
+            "definitions": {
+                "Pet": {
+                    "type": "object",
+                    "properties": {name: {"type": "string"}},
+                    "required": [name],
+                }
+            }
+        }
+    )
+
+    with pytest.raises(TypeError) as e:
+        models.Pet
+    assert "{!r} of Pet".format(name) in str(e.value)
+
+
+def test_load_models_empty():
+    class Empty(middle.Model):
+        pass
+
+    class Holder(middle.Model):
+        empty = middle.field(type=Empty)
+
+    for api in (parse(Holder), parse(Holder, openapi_minify=True)):
+        models = load_models(api)
+        holder = models.Holder(empty={})
+
+        assert isinstance(holder.empty, models.Empty)
+        assert not models.skeleton("Empty").children
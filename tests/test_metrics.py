@@ -0,0 +1,67 @@
+import enum
+import typing as t
+
+import middle
+
+import middle_schema
+from middle_schema.openapi import parse
+from middle_schema.skel import translate
+
+
+@enum.unique
+class PlatformEnum(str, enum.Enum):
+    XBOX1 = "XBOX1"
+    PC = "PC"
+
+
+class Player(middle.Model):
+    nickname = middle.field(type=str)
+
+
+class Game(middle.Model):
+    platform = middle.field(type=PlatformEnum, description="The platform")
+    players = middle.field(type=t.List[Player])
+
+
+def test_stats():
+    middle_schema.reset_stats()
+    translate(Game)
+
+    stats = middle_schema.stats()
+    assert stats["translate_calls"] == 1
+    assert stats["translate_seconds"] > 0
+    # Game, platform (and its str), players (and its Player) and nickname
+    assert stats["nodes_translated"] == 6
+    assert stats["parse_calls"] == 0
+    assert stats["dispatch"]["translate"]["resolutions"] == 6
+    assert stats["dispatch"]["parse"]["resolutions"] == 0
+
+    with middle.config.temp(
+        openapi_model_as_component=True, openapi_enum_as_component=True
+    ):
+        parse(Game)
+
+    stats = middle_schema.stats()
+    assert stats["translate_calls"] == 2
+    assert stats["parse_calls"] == 1
+    assert stats["parse_seconds"] > 0
+    assert stats["nodes_parsed"] == 5  # enums are parsed by their values
+    assert stats["components_emitted"] == 3
+
+
+def test_reset_stats():
+    parse(Game)
+    parse(Game)
+    middle_schema.reset_stats()
+
+    stats = middle_schema.stats()
+    assert stats["translate_calls"] == stats["parse_calls"] == 0
+    assert stats["nodes_translated"] == stats["nodes_parsed"] == 0
+    assert stats["dispatch"]["translate"]["cache_hits"] == 0
+    assert stats["dispatch"]["translate"]["cache_misses"] == 0
+    assert stats["dispatch"]["translate"]["cached_types"] > 0
+
+    parse(Game)
+    stats = middle_schema.stats()
+    assert stats["dispatch"]["parse"]["cache_misses"] == 0
+    assert stats["dispatch"]["parse"]["cache_hits"] == 6
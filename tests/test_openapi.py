@@ -6,7 +6,11 @@ import middle
 import pytest
 from middle.exceptions import InvalidType
 
+from middle_schema.metrics import counters
+from middle_schema.metrics import reset_stats
+from middle_schema.metrics import stats
 from middle_schema.openapi import OpenAPI
+from middle_schema.openapi import iter_components
 from middle_schema.openapi import parse
 
 
@@ -412,3 +416,133 @@ def test_model_within_model_not_as_component():
         "required": ["person", "active"],
     }
     assert api.components == {}
+
+
+def test_minified_output():
+    @enum.unique
+    class TestIntEnum(enum.IntEnum):
+        CAT = 1
+        DOG = 2
+
+    class InnerModel(middle.Model):
+        """Empty model, with a docstring"""
+
+    class TestModel(middle.Model):
+        """Some docstring that should not be there"""
+
+        name = middle.field(type=str, description="The name", min_length=0)
+        tags = middle.field(
+            type=t.List[str], min_items=0, unique_items=False, default=[]
+        )
+        animal = middle.field(type=TestIntEnum, description="An animal")
+        score = middle.field(
+            type=float, minimum=0, exclusive_minimum=False, default=0
+        )
+        inner = middle.field(type=InnerModel)
+
+    with middle.config.temp(openapi_minify=True):
+        api = parse(TestModel)
+
+    assert api.components == {
+        "TestModel": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "animal": {"$ref": "#/components/schemas/TestIntEnum"},
+                "score": {"type": "number", "format": "double", "minimum": 0},
+                "inner": {"$ref": "#/components/schemas/InnerModel"},
+            },
+            "required": ["name", "animal", "inner"],
+        },
+        "TestIntEnum": {
+            "type": "integer",
+            "format": "int64",
+            "choices": [1, 2],
+        },
+        "InnerModel": {"type": "object"},
+    }
+
+
+def test_enum_component_generated_once():
+    @enum.unique
+    class TestStrEnum(str, enum.Enum):
+        CAT = "cat"
+        DOG = "dog"
+
+    class TestModel(middle.Model):
+        first = middle.field(type=TestStrEnum, description="First")
+        second = middle.field(type=TestStrEnum, description="Second")
+        third = middle.field(type=TestStrEnum)
+
+    counters.components_emitted = 0
+    api = parse(TestModel)
+
+    assert counters.components_emitted == 2
+    assert api.components["TestStrEnum"] == {
+        "type": "string",
+        "choices": ["cat", "dog"],
+    }
+    assert api.components["TestModel"]["properties"] == {
+        "first": {
+            "$ref": "#/components/schemas/TestStrEnum",
+            "description": "First",
+        },
+        "second": {
+            "$ref": "#/components/schemas/TestStrEnum",
+            "description": "Second",
+        },
+        "third": {"$ref": "#/components/schemas/TestStrEnum"},
+    }
+
+
+def test_iter_components():
+    @enum.unique
+    class TestStrEnum(str, enum.Enum):
+        CAT = "cat"
+        DOG = "dog"
+
+    class Owner(middle.Model):
+        name = middle.field(type=str)
+        pet = middle.field(type=TestStrEnum)
+
+    class Pet(middle.Model):
+        """A pet"""
+
+        kind = middle.field(type=TestStrEnum)
+        owners = middle.field(type=t.List[Owner])
+        best_friend = middle.field(type=Owner, description="BFF")
+
+    class Shop(middle.Model):
+        pets = middle.field(type=t.Dict[str, Pet])
+        owner = middle.field(type=Owner)
+
+    components = iter_components(Shop)
+
+    counters.nodes_translated = 0
+    assert next(components)[0] == "Shop"
+    # Shop, its fields and the (still not translated) Pet and Owner models
+    assert counters.nodes_translated == 4
+    assert sorted(name for name, _ in components) == [
+        "Owner",
+        "Pet",
+        "TestStrEnum",
+    ]
+    assert dict(iter_components(Shop)) == parse(Shop).components
+    assert dict(
+        iter_components(Pet, Shop, openapi_enum_as_component=False)
+    ) == {
+        **parse(Pet, openapi_enum_as_component=False).components,
+        **parse(Shop, openapi_enum_as_component=False).components,
+    }
+
+    with pytest.raises(ValueError):
+        list(iter_components(Shop, openapi_model_as_component=False))
+
+    # each model is counted (and timed) as a translate and a parse call
+    reset_stats()
+    list(iter_components(Shop))
+    output = stats()
+    assert output["translate_calls"] == output["parse_calls"] == 3
+    assert output["translate_seconds"] > 0
+    assert output["parse_seconds"] > 0
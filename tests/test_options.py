@@ -0,0 +1,112 @@
+import asyncio
+import enum
+import threading
+
+import middle
+import pytest
+
+from middle_schema.openapi import parse
+from middle_schema.options import get_option
+from middle_schema.options import options
+
+
+@enum.unique
+class PlatformEnum(str, enum.Enum):
+    XBOX1 = "XBOX1"
+    PC = "PC"
+
+
+class Player(middle.Model):
+    """A player"""
+
+    nickname = middle.field(type=str, description="The nickname")
+
+
+class Game(middle.Model):
+    platform = middle.field(type=PlatformEnum)
+    player = middle.field(type=Player)
+
+
+def test_options():
+    assert get_option("openapi_minify") is False
+
+    with options(openapi_minify=True):
+        assert get_option("openapi_minify") is True
+        with options(openapi_model_as_component=False):
+            assert get_option("openapi_minify") is True
+            assert get_option("openapi_model_as_component") is False
+        assert get_option("openapi_model_as_component") is True
+    assert get_option("openapi_minify") is False
+
+    with middle.config.temp(openapi_minify=True):
+        assert get_option("openapi_minify") is True
+        with options(openapi_minify=False):
+            assert get_option("openapi_minify") is False
+
+    with pytest.raises(TypeError):
+        with options(openapi_unknown=True):
+            pass
+    with pytest.raises(TypeError):
+        with options(openapi_minify="yes"):
+            pass
+
+
+def test_parse_options():
+    api = parse(Game, openapi_model_as_component=False, openapi_minify=True)
+
+    assert set(api.components) == {"PlatformEnum"}
+    assert "description" not in api.specification["properties"]["player"]
+    assert set(parse(Game).components) == {"Game", "Player", "PlatformEnum"}
+
+
+def test_parse_options_threads():
+    inline = parse(
+        Game, openapi_model_as_component=False, openapi_enum_as_component=False
+    )
+    components = parse(Game)
+    results, barrier = [], threading.Barrier(8)
+
+    def target(kwargs, expected):
+        barrier.wait()
+        results.extend(parse(Game, **kwargs) == expected for _ in range(200))
+
+    threads = [
+        threading.Thread(
+            target=target,
+            args=(
+                {
+                    "openapi_model_as_component": False,
+                    "openapi_enum_as_component": False,
+                },
+                inline,
+            ),
+        )
+        if i % 2
+        else threading.Thread(target=target, args=({}, components))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 1600 and all(results)
+
+
+def test_parse_options_coroutines():
+    async def generate(minify):
+        with options(openapi_minify=minify):
+            await asyncio.sleep(0)
+            return parse(Player)
+
+    async def main():
+        return await asyncio.gather(generate(True), generate(False))
+
+    loop = asyncio.new_event_loop()
+    try:
+        minified, full = loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+    assert "description" not in minified.components["Player"]
+    assert full.components["Player"]["description"] == "A player"
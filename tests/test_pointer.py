@@ -0,0 +1,147 @@
+import typing as t
+
+import middle
+import pytest
+
+from middle_schema.openapi import OpenAPI
+from middle_schema.openapi import parse
+from middle_schema.pointer import dereference
+from middle_schema.pointer import index_document
+
+
+class Person(middle.Model):
+    name = middle.field(type=str)
+
+
+class Game(middle.Model):
+    owner = middle.field(type=Person)
+    players = middle.field(type=t.List[Person])
+
+
+def _ref(name):
+    return {"$ref": "#/components/schemas/{}".format(name)}
+
+
+def test_index_document():
+    api = parse(Game)
+    index = index_document(api)
+
+    assert index[""]["specification"] == api.specification
+    assert index["/components/schemas/Person"] is api.components["Person"]
+    assert index["#/components/schemas/Game/properties/players/items"] == {
+        "$ref": "#/components/schemas/Person"
+    }
+    assert index["/components/schemas/Game/required/1"] == "players"
+    assert "/components/schemas/Player" not in index
+    assert index.get("/components/schemas/Player") is None
+
+    players = index["/components/schemas/Game/properties/players"]
+    assert index.resolve(players["items"]) is api.components["Person"]
+    assert index.resolve(players) is players
+    assert index.resolve(api.specification) is api.components["Game"]
+    assert (
+        index.resolve("#/components/schemas/Person")
+        is api.components["Person"]
+    )
+
+
+def test_index_escaping():
+    document = {
+        "definitions": {"a/b": {"type": "string"}, "c~d": {"type": "integer"}},
+        "x": {"$ref": "#/definitions/a~1b"},
+        "y": {"$ref": "#/definitions/c~0d"},
+        "z": {"$ref": "#/definitions/a~1b%20"},
+        "%20": 1,
+    }
+    index = index_document(document)
+
+    assert index.resolve(document["x"]) == {"type": "string"}
+    assert index.resolve(document["y"]) == {"type": "integer"}
+    assert index["#/%2520"] == 1
+
+    with pytest.raises(KeyError):
+        index.resolve(document["z"])
+
+
+def test_index_chains_and_cycles():
+    document = {
+        "a": {"$ref": "#/b"},
+        "b": {"$ref": "#/c"},
+        "c": {"type": "string"},
+        "d": {"$ref": "#/e"},
+        "e": {"$ref": "#/f"},
+        "f": {"$ref": "#/d"},
+        "g": {"$ref": "other.json#/a"},
+    }
+    index = index_document(document)
+
+    assert index.resolve("#/a") is document["c"]
+    assert index.resolve(document["b"]) is document["c"]
+
+    with pytest.raises(ValueError) as e:
+        index.resolve("#/d")
+    assert str(e.value) == "circular reference: #/d -> #/e -> #/f -> #/d"
+
+    with pytest.raises(ValueError):
+        index.resolve(document["g"])
+
+
+def test_dereference():
+    api = parse(Game)
+    output = dereference(api)
+
+    assert output.components == {}
+    assert output.specification == {
+        "type": "object",
+        "properties": {
+            "owner": api.components["Person"],
+            "players": {"type": "array", "items": api.components["Person"]},
+        },
+        "required": ["owner", "players"],
+    }
+    # shared, not copied
+    properties = output.specification["properties"]
+    assert properties["owner"] is api.components["Person"]
+    assert properties["players"]["items"] is api.components["Person"]
+
+    document = {
+        "a": {"$ref": "#/b", "description": "A"},
+        "b": {"type": "string"},
+    }
+    assert dereference(document) == {
+        "a": {"type": "string", "description": "A"},
+        "b": {"type": "string"},
+    }
+    assert dereference(document)["b"] is document["b"]
+
+
+def test_dereference_cycles():
+    node = {
+        "type": "object",
+        "properties": {"children": {"type": "array", "items": _ref("Node")}},
+    }
+    api = OpenAPI(
+        components={
+            "Node": node,
+            "A": {"type": "object", "properties": {"b": _ref("B")}},
+            "B": {"type": "object", "properties": {"a": _ref("A")}},
+            "Tree": {
+                "type": "object",
+                "properties": {"root": _ref("Node"), "a": _ref("A")},
+            },
+        },
+        specification=_ref("Tree"),
+    )
+    output = dereference(api)
+
+    # only the $ref closing cycles are left, with their components
+    assert sorted(output.components) == ["A", "Node"]
+    assert output.components["Node"] is node
+    assert output.specification["properties"]["root"] is node
+    assert output.specification["properties"]["a"] == {
+        "type": "object",
+        "properties": {
+            "b": {"type": "object", "properties": {"a": _ref("A")}}
+        },
+    }
+    assert output.components["A"] == output.specification["properties"]["a"]
@@ -0,0 +1,82 @@
+import io
+import json
+import typing as t
+
+import middle
+
+from middle_schema import openapi
+from middle_schema import skel
+from middle_schema.openapi import parse
+from middle_schema.profiling import Profiler
+from middle_schema.profiling import profile
+
+
+class Player(middle.Model):
+    nickname = middle.field(type=str, min_length=3)
+
+
+class Game(middle.Model):
+    name = middle.field(type=str)
+    players = middle.field(type=t.List[Player])
+
+
+def test_profile():
+    translate_type, parse_type = skel._translate_type, openapi._parse_type
+
+    with profile() as profiler:
+        api = parse(Game)
+
+    assert skel._translate_type is translate_type
+    assert openapi._parse_type is parse_type
+    assert api == parse(Game)
+
+    paths = {(e.phase, e.handler, e.path) for e in profiler.events}
+    assert ("translate", "_translate_model_meta", "Game") in paths
+    assert (
+        "translate",
+        "_translate_type_generic",
+        "Game.players.Player.nickname",
+    ) in paths
+    assert (
+        "parse",
+        "_parse_type_str",
+        "Game.players.Player.nickname",
+    ) in paths
+
+    # every event is inside the root event of its own phase
+    roots = {e.phase: e for e in profiler.events if e.path == "Game"}
+    assert sorted(roots) == ["parse", "translate"]
+    assert all(e.own <= e.elapsed for e in profiler.events)
+    assert all(e.elapsed <= roots[e.phase].elapsed for e in profiler.events)
+
+
+def test_profile_report():
+    profiler = Profiler()
+    with profile(profiler):
+        parse(Game)
+    with profile(profiler):
+        parse(Game)
+
+    report = profiler.report()
+    rows = {(r["phase"], r["handler"]): r for r in report}
+    assert rows[("translate", "_translate_model_meta")]["calls"] == 4
+    assert rows[("parse", "_parse_type_str")]["calls"] == 4
+    assert [r["own"] for r in report] == sorted(
+        (r["own"] for r in report), reverse=True
+    )
+    assert "_parse_type_str" in profiler.format_report()
+
+
+def test_profile_chrome_trace():
+    with profile() as profiler:
+        parse(Game)
+
+    fp = io.StringIO()
+    profiler.dump_chrome_trace(fp)
+    trace = json.loads(fp.getvalue())
+
+    assert len(trace["traceEvents"]) == len(profiler.events)
+    event = trace["traceEvents"][0]
+    assert event["ph"] == "X"
+    assert event["ts"] >= 0 and event["dur"] >= 0
+    assert "path" in event["args"]
@@ -0,0 +1,98 @@
+import typing as t
+
+import middle
+import pytest
+
+from middle_schema.metrics import counters
+from middle_schema.openapi import parse
+from middle_schema.projection import project
+
+
+class Address(middle.Model):
+    """An address"""
+
+    street = middle.field(type=str, description="The street")
+    city = middle.field(type=str)
+
+
+class Person(middle.Model):
+    name = middle.field(type=str, min_length=2)
+    age = middle.field(type=int)
+    address = middle.field(type=Address)
+    others = middle.field(type=t.Dict[str, t.List[Address]])
+
+
+def test_project():
+    api = project(Person, ["name", "address.city", "others.street"])
+
+    assert api.components == {}
+    assert api.specification == {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "minLength": 2},
+            "address": {
+                "type": "object",
+                "properties": {"city": {"type": "string"}},
+                "required": ["city"],
+                "description": "An address",
+            },
+            "others": {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "street": {
+                                "type": "string",
+                                "description": "The street",
+                            }
+                        },
+                        "required": ["street"],
+                        "description": "An address",
+                    },
+                },
+            },
+        },
+        "required": ["name", "address", "others"],
+    }
+
+
+def test_project_whole_fields():
+    api = project(Person, ["age", "address", "address.city"])
+
+    assert api.components == {"Address": parse(Address).components["Address"]}
+    assert api.specification["properties"]["address"] == {
+        "$ref": "#/components/schemas/Address"
+    }
+    assert api.specification["required"] == ["age", "address"]
+
+    api = project(Person, ["name"], openapi_model_as_component=False)
+    assert api.components == {}
+    assert list(api.specification["properties"]) == ["name"]
+
+
+def test_project_cache():
+    api = project(Person, ["name", "address.city"])
+
+    counters.nodes_translated = 0
+    assert project(Person, ["address.city", "name"]) is api
+    assert project(Person, ["age", "address.street"]) is not api
+    assert counters.nodes_translated == 0  # the skeleton is cached
+
+    assert project(Person, ["name"], openapi_minify=True) is not project(
+        Person, ["name"]
+    )
+
+
+def test_project_errors():
+    with pytest.raises(ValueError):
+        project(Person, ["nickname"])
+    with pytest.raises(ValueError):
+        project(Person, ["address.country"])
+    with pytest.raises(ValueError):
+        project(Person, ["name.first"])
+    with pytest.raises(ValueError):
+        project(Person, [])
+    with pytest.raises(TypeError):
+        project(Person, "name")
@@ -0,0 +1,129 @@
+import typing as t
+
+import middle
+import pytest
+
+from middle_schema.openapi import parse
+from middle_schema.routes import Routes
+
+
+class Person(middle.Model):
+    name = middle.field(type=str)
+
+
+class Game(middle.Model):
+    owner = middle.field(type=Person)
+
+
+def test_routes():
+    routes = Routes()
+
+    @routes.route("/games", methods=["post"])
+    def create_game(request, game: Game) -> Game:
+        """Creates a game"""
+
+    @routes.route("/games", methods=["GET"])
+    def list_games(request, limit: int) -> t.List[Game]:
+        pass
+
+    @routes.route("/games/{id}", methods=["DELETE"])
+    def delete_game(request, id: str) -> None:
+        pass
+
+    assert len(routes) == 3
+    assert routes.generated == []
+
+    schema = routes.schema("POST", "/games")
+    assert routes.generated == [("POST", "/games")]
+    assert routes.schema("post", "/games") is schema  # cached
+    assert schema.request == parse(Game)
+    assert schema.response == parse(Game)
+    assert schema.operation() == {
+        "description": "Creates a game",
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/Game"}
+                }
+            },
+            "required": True,
+        },
+        "responses": {
+            "200": {
+                "description": "",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/Game"}
+                    }
+                },
+            }
+        },
+    }
+
+    schema = routes.schema("GET", "/games")
+    assert schema.request is None
+    assert schema.response.specification == {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/Game"},
+    }
+
+    assert routes.schema("DELETE", "/games/{id}").operation() == {
+        "responses": {"204": {"description": ""}}
+    }
+
+    with pytest.raises(KeyError):
+        routes.schema("PUT", "/games")
+    with pytest.raises(ValueError):
+        routes.add("/games", create_game, methods=["FETCH"])
+
+
+def test_routes_document():
+    routes = Routes(options={"openapi_model_as_component": False})
+
+    def get_person(request) -> Person:
+        pass
+
+    routes.add("/person", get_person, methods=["GET", "HEAD"])
+    document = routes.document()
+
+    assert sorted(routes.generated) == [
+        ("GET", "/person"),
+        ("HEAD", "/person"),
+    ]
+    assert list(document["paths"]["/person"]) == ["get", "head"]
+    assert document["components"] == {"schemas": {}}
+    content = document["paths"]["/person"]["get"]["responses"]["200"][
+        "content"
+    ]
+    assert (
+        content["application/json"]["schema"]
+        == parse(Person, openapi_model_as_component=False).specification
+    )
+
+    # replacing a handler drops its schema
+    def get_game(request) -> Game:
+        pass
+
+    routes.add("/person", get_game)
+    assert routes.generated == [("HEAD", "/person")]
+
+
+def test_routes_framework_response():
+    class Response:
+        pass
+
+    routes = Routes()
+
+    @routes.route("/games", methods=["POST"])
+    def create_game(request, game: Game) -> Response:
+        pass
+
+    @routes.route("/names", methods=["GET"])
+    def list_names(request) -> t.List[str]:
+        pass
+
+    schema = routes.schema("POST", "/games")
+    assert schema.request == parse(Game)
+    assert schema.response is None
+    assert routes.schema("GET", "/names").response is None
+    assert list(routes.document()["paths"]) == ["/games", "/names"]
@@ -0,0 +1,107 @@
+import datetime
+import enum
+import json
+import typing as t
+from decimal import Decimal
+
+import middle
+
+from middle_schema.serializer import compile_serializer
+from middle_schema.skel import translate
+
+
+@enum.unique
+class LanguageEnum(enum.IntEnum):
+    ENGLISH = 1
+    JAPANESE = 2
+
+
+class Author(middle.Model):
+    name = middle.field(type=str)
+    born = middle.field(type=datetime.date, default=None)
+
+
+class Chapter(middle.Model):
+    title = middle.field(type=str)
+    pages = middle.field(type=int)
+
+
+class Book(middle.Model):
+    title = middle.field(type=str)
+    price = middle.field(type=Decimal)
+    language = middle.field(type=LanguageEnum)
+    published_at = middle.field(type=datetime.datetime)
+    author = middle.field(type=Author)
+    chapters = middle.field(type=t.List[Chapter])
+    tags = middle.field(type=t.Set[str], default=set())
+    ratings = middle.field(type=t.Dict[str, float], default={})
+    translations = middle.field(type=t.Dict[str, LanguageEnum], default={})
+    in_stock = middle.field(type=bool, default=True)
+
+
+def _book():
+    return Book(
+        title="Some book",
+        price=Decimal("10.5"),
+        language=1,
+        published_at="2018-08-01T10:00:00+00:00",
+        author={"name": "Someone", "born": "1980-10-10"},
+        chapters=[{"title": "One", "pages": 10}, {"title": "Two", "pages": 5}],
+        tags={"fiction"},
+        translations={"pt": 2},
+    )
+
+
+def test_serializer():
+    serialize = compile_serializer(Book)
+    data = serialize(_book())
+
+    assert data == {
+        "title": "Some book",
+        "price": 10.5,
+        "language": 1,
+        "published_at": "2018-08-01T10:00:00+00:00",
+        "author": {"name": "Someone", "born": "1980-10-10"},
+        "chapters": [
+            {"title": "One", "pages": 10},
+            {"title": "Two", "pages": 5},
+        ],
+        "tags": ["fiction"],
+        "ratings": {},
+        "translations": {"pt": 2},
+        "in_stock": True,
+    }
+    assert json.loads(json.dumps(data)) == data
+
+
+def test_serializer_agrees_with_middle():
+    serialize = compile_serializer(translate(Chapter))
+    chapter = Chapter(title="One", pages=10)
+
+    assert serialize(chapter) == middle.asdict(chapter)
+
+
+def test_serializer_decimal():
+    serialize = compile_serializer(Book, decimal=str)
+
+    assert serialize(_book())["price"] == "10.5"
+
+
+def test_serializer_union():
+    class TestModel(middle.Model):
+        value = middle.field(type=t.Union[Chapter, Author])
+
+    serialize = compile_serializer(TestModel)
+
+    assert serialize(TestModel(value=Author(name="Someone"))) == {
+        "value": {"name": "Someone", "born": None}
+    }
+    assert serialize(TestModel(value=Chapter(title="One", pages=1))) == {
+        "value": {"title": "One", "pages": 1}
+    }
+
+
+def test_serializer_field_type():
+    serialize = compile_serializer(t.List[LanguageEnum])
+
+    assert serialize([LanguageEnum.ENGLISH, LanguageEnum.JAPANESE]) == [1, 2]
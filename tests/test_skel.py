@@ -1,12 +1,54 @@
+import datetime
 import enum
+import json
+import pickle
+import sys
 import typing as t
+from decimal import Decimal
 
 import middle
 import pytest
 from middle.exceptions import InvalidType
 
 from middle_schema.skel import Skeleton
+from middle_schema.skel import dumps
+from middle_schema.skel import from_portable
+from middle_schema.skel import loads
+from middle_schema.skel import to_portable
 from middle_schema.skel import translate
+from middle_schema.skel import translate_shallow
+
+
+# portable skeletons reference types by their qualified names, so these must
+# be importable (declared on the module level)
+
+
+@enum.unique
+class PortableEnum(enum.IntEnum):
+    ONE = 1
+    TWO = 2
+
+
+class PortableInner(middle.Model):
+    """Inner model"""
+
+    created = middle.field(
+        type=datetime.datetime,
+        default=datetime.datetime(
+            2018, 8, 1, 12, 30, tzinfo=datetime.timezone.utc
+        ),
+    )
+    day = middle.field(type=datetime.date, default=datetime.date(2018, 8, 1))
+
+
+class PortableModel(middle.Model):
+    name = middle.field(type=str, description="The name", min_length=5)
+    price = middle.field(type=Decimal, default=Decimal("1.50"))
+    data = middle.field(type=bytes, default=b"\x00\x01")
+    level = middle.field(type=PortableEnum, default=PortableEnum.TWO)
+    tags = middle.field(type=t.List[str], default=list, min_items=1)
+    inner = middle.field(type=PortableInner)
+    scores = middle.field(type=t.Dict[str, t.Set[int]])
 
 
 def test_simple_model():
@@ -109,7 +151,7 @@ def test_enum_choices():
     assert skel.validator_data.rules is None
     assert skel.validator_data.type_check == TestIntEnum
     assert skel.type_specific is not None
-    assert skel.type_specific == {"choices": [1, 2, 3]}
+    assert skel.type_specific == {"choices": (1, 2, 3)}
 
     skel = skel.children[0]
 
@@ -124,6 +166,25 @@ def test_enum_choices():
     assert skel.nullable is False
 
 
+def test_enum_choices_are_shared():
+    @enum.unique
+    class TestStrEnum(str, enum.Enum):
+        CAT = "cat"
+        DOG = "dog"
+
+    class TestModel(middle.Model):
+        first = middle.field(type=TestStrEnum, description="First")
+        second = middle.field(type=TestStrEnum, default=TestStrEnum.CAT)
+
+    first, second = translate(TestModel).children
+
+    assert first.type_specific["choices"] == ("cat", "dog")
+    assert first.type_specific["choices"] is second.type_specific["choices"]
+    assert first.children[0] is second.children[0]
+    assert first.description == "First"
+    assert second.default_value == TestStrEnum.CAT
+
+
 def test_dict_type():
     class TestModel(middle.Model):
         options = middle.field(
@@ -326,3 +387,103 @@ def test_union_type_not_nullable():
     assert skel_float.type_specific is None
     assert skel_float.description is None
     assert skel_float.nullable is False
+
+
+def test_translate_shallow():
+    class Inner(middle.Model):
+        name = middle.field(type=str)
+
+    class Outer(middle.Model):
+        inner = middle.field(type=Inner)
+        inners = middle.field(type=t.List[Inner])
+
+    skel = translate_shallow(Outer)
+
+    assert skel.type == Outer
+    assert len(skel.children) == 2
+    assert skel.children[0].type == Inner
+    assert skel.children[0].name == "inner"
+    assert skel.children[0].children is None
+    assert skel.children[1].children[0].type == Inner
+    assert skel.children[1].children[0].children is None
+
+    # not shallow anymore
+    assert translate(Outer).children[0].children[0].type == str
+
+
+def test_portable_skeleton():
+    skel = translate(PortableModel)
+    data = to_portable(skel)
+
+    json.dumps(data)  # plain data
+    assert from_portable(data) == skel
+    assert loads(dumps(PortableModel)) == skel
+    assert pickle.loads(pickle.dumps(skel)) == skel
+
+    # sentinels are kept
+    copy = loads(dumps(skel))
+    fields = {c.name: c for c in copy.children}
+    assert not copy.has_default_value
+    assert not fields["name"].has_default_value
+    assert fields["price"].has_default_value
+    assert fields["tags"].default_value is list
+    assert not fields["tags"].children[0].has_default_value
+
+    # every type is listed only once
+    assert len(data["t"]) == len(set(map(str, data["t"])))
+
+    for type_ in (t.Union[int, float], t.Union[int, None, t.List[str]]):
+        skel = translate(type_)
+        assert loads(dumps(skel)) == skel
+
+
+def test_portable_skeleton_errors():
+    class LocalModel(middle.Model):
+        name = middle.field(type=str)
+
+    with pytest.raises(ValueError):
+        to_portable(LocalModel)
+
+    data = to_portable(PortableInner)
+    data["v"] = 0
+
+    with pytest.raises(ValueError):
+        from_portable(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # calling os.system with a command from the payload
+        '{"v":1,"t":["builtins:int","os:system"],'
+        '"r":{"t":0,"d":{"E":[1,"echo PWNED"]}}}',
+        '{"v":1,"t":["os:system"],"r":{"t":0}}',
+        '{"v":1,"t":["builtins:int"],"r":{"t":0,"d":{"E":[0,"1"]}}}',
+        '{"v":1,"t":["builtins:int","os:getcwd"],"r":{"t":0,"d":{"F":1}}}',
+        '{"v":1,"t":["builtins:int"],"r":{"t":0,"d":{"T":5}}}',
+        '{"v":1,"t":[["cast",0]],"r":{"t":0}}',
+        '{"v":1,"t":["builtins:int"],"r":{"t":0,"d":{"Z":1}}}',
+        # importing a module (that prints the Zen of Python) not imported yet
+        '{"v":1,"t":["this:X"],"r":{"t":0}}',
+    ],
+)
+def test_portable_skeleton_hostile(data, capfd):
+    imported = set(sys.modules)
+    with pytest.raises(ValueError):
+        loads(data)
+    out = capfd.readouterr().out
+    assert "PWNED" not in out and "Zen" not in out
+    assert set(sys.modules) == imported
+
+
+def test_portable_skeleton_modules():
+    data = '{"v":1,"t":["this:X"],"r":{"t":0}}'
+
+    with pytest.raises(ValueError) as err:
+        loads(data)
+    assert "'this' is not imported" in str(err.value)
+
+    # trusted modules are imported, but still only classes are loaded
+    with pytest.raises(ValueError) as err:
+        loads(data, modules=["this"])
+    assert "is not a class" in str(err.value)
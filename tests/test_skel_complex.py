@@ -137,7 +137,7 @@ def test_complex_model():
             assert c.validator_data.type_check == PlatformEnum
             assert c.type_specific is not None
             assert c.type_specific == {
-                "choices": ["XBOX1", "PLAYSTATION4", "PC"]
+                "choices": ("XBOX1", "PLAYSTATION4", "PC")
             }
             # choices type
             assert isinstance(c.children[0], Skeleton)
@@ -305,7 +305,7 @@ def test_complex_model():
             assert c.validator_data.type_check == LanguageEnum
             assert c.validator_data.rules is None
             assert c.type_specific is not None
-            assert c.type_specific == {"choices": [1, 2, 3, 4, 5]}
+            assert c.type_specific == {"choices": (1, 2, 3, 4, 5)}
             # choices type
             assert isinstance(c.children[0], Skeleton)
             assert c.children[0].children is None
@@ -353,7 +353,7 @@ def test_complex_model():
                     assert ci.validator_data.rules is None
                     assert ci.type_specific is not None
                     assert ci.type_specific == {
-                        "choices": ["TROPICAL", "TEMPERATE", "BOREAL"]
+                        "choices": ("TROPICAL", "TEMPERATE", "BOREAL")
                     }
                     # choices type
                     assert isinstance(ci.children[0], Skeleton)
@@ -0,0 +1,180 @@
+import datetime
+import enum
+import typing as t
+
+import middle
+
+from middle_schema.skel import translate
+from middle_schema.validator import compile_validator
+
+
+@enum.unique
+class PlatformEnum(str, enum.Enum):
+    XBOX1 = "XBOX1"
+    PLAYSTATION4 = "PLAYSTATION4"
+    PC = "PC"
+
+
+class Player(middle.Model):
+    nickname = middle.field(type=str, min_length=3)
+    youtube_channel = middle.field(type=str, default=None)
+
+
+class City(middle.Model):
+    name = middle.field(type=str)
+    founded = middle.field(type=datetime.date, default=None)
+
+
+class Game(middle.Model):
+    name = middle.field(type=str, max_length=10)
+    platform = middle.field(type=PlatformEnum)
+    score = middle.field(type=float, minimum=0, maximum=10, multiple_of=0.5)
+    resolution_tested = middle.field(type=str, pattern=r"^\d+x\d+$")
+    genre = middle.field(type=t.List[str], min_items=1, unique_items=True)
+    rating = middle.field(type=t.Dict[str, int], min_properties=1)
+    players = middle.field(type=t.List[Player], default=[])
+    released = middle.field(type=bool, default=True)
+    location = middle.field(type=t.Union[Player, City], default=None)
+
+
+def _valid_game(**kwargs):
+    data = {
+        "name": "Some game",
+        "platform": "PC",
+        "score": 9.5,
+        "resolution_tested": "1920x1080",
+        "genre": ["action", "adventure"],
+        "rating": {"some website": 8},
+    }
+    data.update(kwargs)
+    return data
+
+
+def test_valid_payload():
+    validate = compile_validator(Game)
+
+    assert validate(_valid_game()) == []
+    assert (
+        validate(
+            _valid_game(
+                players=[{"nickname": "vltr"}],
+                location={"name": "Curitiba", "founded": "1693-03-29"},
+                released=False,
+            )
+        )
+        == []
+    )
+    assert validate(_valid_game(location=None)) == []
+
+    # and it really agrees with ``middle``
+    game = Game(**_valid_game(location=City(name="Curitiba")))
+    assert isinstance(game, Game)
+
+
+def test_accepts_skeleton():
+    validate = compile_validator(translate(Player))
+
+    assert validate({"nickname": "vltr"}) == []
+    assert validate({"nickname": "v"}) == [
+        ("nickname", "must have a minimum length of 3 chars")
+    ]
+
+
+def test_fail_fast():
+    validate = compile_validator(Game)
+
+    assert validate({}) == [("name", "is required")]
+    assert validate([]) == [("", "must be an object")]
+    assert validate(_valid_game(score=11, genre=[])) == [
+        ("score", "must have a maximum value of 10")
+    ]
+
+
+def test_collect_all():
+    validate = compile_validator(Game, fail_fast=False)
+
+    assert validate({}) == [
+        ("name", "is required"),
+        ("platform", "is required"),
+        ("score", "is required"),
+        ("resolution_tested", "is required"),
+        ("genre", "is required"),
+        ("rating", "is required"),
+    ]
+    assert validate(
+        _valid_game(
+            name="A very long name",
+            platform="SEGA",
+            score=-1.2,
+            resolution_tested="full hd",
+            genre=["action", "action"],
+            rating={"some website": 8.7},
+            players=[{"nickname": "vltr"}, {"nickname": 1}],
+            released="yes",
+            location={"name": 42},
+        )
+    ) == [
+        ("name", "must have a maximum length of 10 chars"),
+        ("platform", "must be one of the allowed choices"),
+        ("score", "must have a minimum value of 0"),
+        ("score", "must be multiple of 0.5"),
+        (
+            "resolution_tested",
+            "did not match the given pattern: '^\\d+x\\d+$'",
+        ),
+        ("genre", "must only have unique items"),
+        ("rating.some website", "must be an integer"),
+        ("players[1].nickname", "must be a string"),
+        ("released", "must be a boolean"),
+        ("location", "does not match any of the allowed types"),
+    ]
+
+
+def test_types():
+    class TestModel(middle.Model):
+        some_int = middle.field(type=int, default=0)
+        some_bytes = middle.field(type=bytes, default=b"")
+        some_datetime = middle.field(type=datetime.datetime, default=None)
+        some_set = middle.field(type=t.Set[int], default=set())
+        some_enum = middle.field(type=PlatformEnum, default=PlatformEnum.PC)
+
+    validate = compile_validator(TestModel, fail_fast=False)
+
+    assert validate({}) == []
+    assert (
+        validate(
+            {
+                "some_int": 1,
+                "some_bytes": "Zm9v",
+                "some_datetime": "2018-08-01T10:00:00Z",
+                "some_set": [1, 2],
+                "some_enum": PlatformEnum.XBOX1,
+            }
+        )
+        == []
+    )
+    assert validate(
+        {
+            "some_int": True,
+            "some_bytes": 1,
+            "some_datetime": "2018-08-01",
+            "some_set": 1,
+            "some_enum": ["PC"],
+        }
+    ) == [
+        ("some_int", "must be an integer"),
+        ("some_bytes", "must be a string"),
+        ("some_datetime", "must be a date-time"),
+        ("some_set", "must be an array"),
+        ("some_enum", "must be one of the allowed choices"),
+    ]
+
+
+def test_dict_keys():
+    validate = compile_validator(t.Dict[str, int], fail_fast=False)
+
+    assert validate({"a": 1}) == []
+    assert validate({1: 1, "b": "c"}) == [
+        ("", "must only have string keys"),
+        ("b", "must be an integer"),
+    ]